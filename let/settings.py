@@ -33,6 +33,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # Outermost, so its total covers the rest of the stack.
+    "myapp.instrumentation.RequestMetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -63,6 +65,10 @@ TEMPLATES = [
 WSGI_APPLICATION = "let.wsgi.application"
 
 # --- DATABASE (READ FROM .ENV) ---
+# Connections are kept open between requests and Celery tasks for
+# DB_CONN_MAX_AGE seconds ("none" for no limit, 0 to close after each) and
+# checked before being reused. docker-compose.yml sets it per service.
+# Compare with `benchmark_db_connections`.
 DATABASES = {
     "default": {
         "ENGINE": config('DB_ENGINE'),
@@ -71,9 +77,43 @@ DATABASES = {
         "PASSWORD": config('DB_PASSWORD'),
         "HOST": config('DB_HOST'),
         "PORT": config('DB_PORT', cast=int),
+        "CONN_MAX_AGE": config(
+            'DB_CONN_MAX_AGE', default='60', cast=lambda v: None if v.lower() == 'none' else int(v)
+        ),
+        "CONN_HEALTH_CHECKS": config('DB_CONN_HEALTH_CHECKS', default=True, cast=bool),
     }
 }
 
+# --- CACHE (READ FROM .ENV) ---
+# Analytics responses are cached in Redis when CACHE_URL is set (e.g.
+# redis://redis:6379/1, a different database from the Celery broker);
+# otherwise a bounded per-process memory cache is used. Uploads bump the
+# data version in the Celery worker, which a per-process cache never sees:
+# analytics then send no ETags and serve cached payloads until
+# ANALYTICS_CACHE_TIMEOUT. Deployments with more than one process must set
+# CACHE_URL.
+CACHE_URL = config('CACHE_URL', default='')
+if CACHE_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": CACHE_URL,
+            "KEY_PREFIX": "let",
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "OPTIONS": {"MAX_ENTRIES": config('CACHE_MAX_ENTRIES', default=1000, cast=int)},
+        }
+    }
+ANALYTICS_CACHE_TIMEOUT = config('ANALYTICS_CACHE_TIMEOUT', default=900, cast=int)
+ANALYTICS_CACHE_MAX_ENTRY_BYTES = config('ANALYTICS_CACHE_MAX_ENTRY_BYTES', default=256 * 1024, cast=int)
+# Applicants aggregated per ?approx=true analytics request (TABLESAMPLE); tables
+# up to this size are summarized exactly.
+ANALYTICS_APPROX_SAMPLE_ROWS = config('ANALYTICS_APPROX_SAMPLE_ROWS', default=50000, cast=int)
+
 # --- PASSWORD VALIDATION (NO CHANGE) ---
 AUTH_PASSWORD_VALIDATORS = [
     {"NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator"},
@@ -103,6 +143,25 @@ CELERY_RESULT_BACKEND = "django-db"
 CELERY_RESULT_EXTENDED = True
 CELERY_TASK_TRACK_STARTED = True
 
+# Stream uploads into PostgreSQL with COPY instead of bulk_create.
+INGEST_USE_COPY = config('INGEST_USE_COPY', default=True, cast=bool)
+# Uploads are split into chunks of about this size and ingested in parallel.
+INGEST_CHUNK_BYTES = config('INGEST_CHUNK_BYTES', default=16 * 1024 * 1024, cast=int)
+INGEST_CHUNK_ROWS = config('INGEST_CHUNK_ROWS', default=50000, cast=int)
+# Rows converted per column block within a chunk; 0 ingests row by row.
+INGEST_BLOCK_ROWS = config('INGEST_BLOCK_ROWS', default=5000, cast=int)
+# Cap on rejected rows / dropped values written to each chunk's error report.
+INGEST_MAX_REPORTED_ISSUES = config('INGEST_MAX_REPORTED_ISSUES', default=10000, cast=int)
+# Rows fetched per round trip by the server-side cursor behind exports.
+EXPORT_CHUNK_SIZE = config('EXPORT_CHUNK_SIZE', default=2000, cast=int)
+
+# --- REQUEST METRICS ---
+# Fraction of requests timed and given a Server-Timing header (0 disables
+# the middleware and the ingest task metrics); requests slower than
+# METRICS_SLOW_REQUEST_MS are logged.
+METRICS_SAMPLE_RATE = config('METRICS_SAMPLE_RATE', default=0.0, cast=float)
+METRICS_SLOW_REQUEST_MS = config('METRICS_SLOW_REQUEST_MS', default=1000, cast=int)
+
 # --- CORS (READ FROM .ENV) ---
 CORS_ALLOWED_ORIGINS = config('CORS_ALLOWED_ORIGINS', cast=lambda v: [s.strip() for s in v.split(',')])
 CORS_ALLOW_CREDENTIALS = True
@@ -110,7 +169,7 @@ CORS_ALLOW_CREDENTIALS = True
 # --- DJANGO REST FRAMEWORK SETTINGS ---
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "myapp.authentication.RegionJWTAuthentication",
     ],
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticated",
@@ -123,5 +182,8 @@ REST_FRAMEWORK = {
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=60),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=1),
+    # Tokens carry the user's region scope (see myapp.authentication).
+    "TOKEN_OBTAIN_SERIALIZER": "myapp.authentication.RegionTokenObtainPairSerializer",
+    "TOKEN_REFRESH_SERIALIZER": "myapp.authentication.RegionTokenRefreshSerializer",
 }
 # TEMPORARY DEBUGGING LINES - REMOVE AFTER FIXING
@@ -13,6 +13,13 @@ class UserProfileInline(admin.StackedInline):
 class UserAdmin(DjangoUserAdmin):
     inlines = (UserProfileInline,)
 
+    def get_inline_instances(self, request, obj=None):
+        # Adding a user creates its profile (see signals), so the region is
+        # set on the change form that follows.
+        if obj is None:
+            return []
+        return super().get_inline_instances(request, obj)
+
 
 admin.site.unregister(User)
 admin.site.register(User, UserAdmin)
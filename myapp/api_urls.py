@@ -1,14 +1,69 @@
 from django.urls import path
-from . import apis
+from . import apis, async_apis
 
 urlpatterns = [
     path("me/", apis.MeApi.as_view(), name="me"),
     path("students/", apis.ApplicantListView.as_view(), name="applicant-list"),
+    path("students/search/", apis.ApplicantSearchView.as_view(), name="applicant-search"),
+    path("students/export/", apis.ApplicantExportView.as_view(), name="applicant-export"),
+    path(
+        "students/export/<int:pk>/",
+        apis.ExportJobDetailView.as_view(),
+        name="applicant-export-job",
+    ),
+    path(
+        "students/export/<int:pk>/download/",
+        apis.ExportJobDownloadView.as_view(),
+        name="applicant-export-download",
+    ),
     path(
         "students/bulk-upload/", apis.FileUploadView.as_view(), name="applicant-upload"
     ),
+    path(
+        "students/bulk-upload/<int:pk>/",
+        apis.UploadJobDetailView.as_view(),
+        name="upload-job",
+    ),
+    path(
+        "students/bulk-upload/<int:pk>/errors/",
+        apis.UploadJobErrorsView.as_view(),
+        name="upload-errors",
+    ),
     path("analytics/kpis/", apis.KPIView.as_view(), name="kpis"),
     path("analytics/charts/", apis.ChartDataView.as_view(), name="charts"),
+    path("analytics/dashboard/", apis.DashboardView.as_view(), name="dashboard"),
+    path("analytics/facets/", apis.FacetsView.as_view(), name="facets"),
+    path("analytics/timeseries/", apis.TimeseriesView.as_view(), name="timeseries"),
+    path(
+        "analytics/cache-stats/", apis.CacheStatsView.as_view(), name="cache-stats"
+    ),
+    # Async variants, for the ASGI (daphne) workers.
+    path("analytics/async/kpis/", async_apis.AsyncKPIView.as_view(), name="async-kpis"),
+    path(
+        "analytics/async/charts/",
+        async_apis.AsyncChartDataView.as_view(),
+        name="async-charts",
+    ),
+    path(
+        "analytics/async/facets/",
+        async_apis.AsyncFacetsView.as_view(),
+        name="async-facets",
+    ),
+    path(
+        "analytics/async/timeseries/",
+        async_apis.AsyncTimeseriesView.as_view(),
+        name="async-timeseries",
+    ),
+    path(
+        "analytics/async/filter-options/",
+        async_apis.AsyncFilterOptionsView.as_view(),
+        name="async-filter-options",
+    ),
+    path(
+        "analytics/async/dashboard/",
+        async_apis.AsyncDashboardView.as_view(),
+        name="async-dashboard",
+    ),
     path(
         "students/filter-options/",
         apis.FilterOptionsView.as_view(),
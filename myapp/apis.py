@@ -1,16 +1,50 @@
+import tempfile
+from collections import Counter
+from datetime import timedelta
+
 from django.core.files.storage import default_storage
-from django.db.models import Count
+from django.db.models import Count, F, Sum
+from django.http import FileResponse, Http404, StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django.utils.dateparse import parse_date
 from rest_framework import generics, status
+from rest_framework.exceptions import ValidationError
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
 
-from .models import Applicant, UserProfile
-from .serializers import ApplicantSerializer, UserSerializer
-from .tasks import process_uploaded_file
-from django.db.models import Q
-
-from django.db.models.functions import Trim, Lower
+from .cache import CachedResponseMixin, get_cache_stats
+from .ingest import upload_file_error
+from .models import (
+    Applicant,
+    ApplicantDailyRollup,
+    ExportJob,
+    UploadJob,
+    normalize_category,
+)
+from .pagination import ApplicantCursorPagination
+from .rollups import start_of_day
+from .scoping import get_region_scope, get_scoped_applicants, scope_queryset
+from .sampling import (
+    count_sampled_rows,
+    estimate_table_rows,
+    sample_percent,
+    sampled_rows,
+    sampling_supported,
+    scale_summary,
+)
+from .search import rank_search, search_filter
+from .exports import CONTENT_TYPES, export_filename, stream_csv, write_xlsx
+from .serializers import (
+    APPLICANT_FIELDS,
+    ApplicantSerializer,
+    ExportJobSerializer,
+    UploadJobSerializer,
+    UserSerializer,
+)
+from .tasks import export_applicants, process_uploaded_file
+
+from django.db.models.functions import TruncDate, TruncMonth, TruncWeek
 
 
 class MeApi(generics.RetrieveAPIView):
@@ -23,59 +57,672 @@ class MeApi(generics.RetrieveAPIView):
         return self.request.user
 
 
+def parse_day_param(query_params, name):
+
+    value = query_params.get(name)
+    if not value:
+        return None
+    try:
+        day = parse_date(value)
+    except ValueError:
+        day = None
+    if day is None:
+        raise ValidationError({name: "Enter a valid date (YYYY-MM-DD)."})
+    return day
+
+
+CATEGORY_FILTERS = {
+    "status": "clean_status",
+    "courseName": "clean_course",
+    "gender": "clean_gender",
+    "region": "clean_region",
+}
+
+
+def apply_category_filters(queryset, query_params):
+    """
+    Filters on the normalized ``clean_*`` columns, which both ``Applicant``
+    and ``ApplicantDailyRollup`` carry.
+    """
+
+    for param, field in CATEGORY_FILTERS.items():
+        value = normalize_category(query_params.get(param))
+        if value:
+            queryset = queryset.filter(**{field: value})
+
+    return queryset
+
+
+def normalized_filter_params(query_params):
+    """
+    Returns the filter params ``apply_filters`` and ``apply_search`` act on,
+    in normalized form, so equivalent requests compare (and cache) equal.
+    """
+    params = {}
+    for name in ("date_from", "date_to"):
+        day = parse_day_param(query_params, name)
+        if day:
+            params[name] = day.isoformat()
+    for param in CATEGORY_FILTERS:
+        value = normalize_category(query_params.get(param))
+        if value:
+            params[param] = value
+    search_query = query_params.get("search")
+    if search_query:
+        params["search"] = search_query
+    return params
+
+
 def apply_filters(queryset, query_params):
+    """
+    Applies the dashboard filters against the normalized ``clean_*`` columns
+    and a half-open range on ``application_submitted_at``, so every
+    predicate can be served by the composite indexes on ``Applicant``.
+    """
+
+    return apply_category_filters(apply_date_filters(queryset, query_params), query_params)
+
+
+def apply_date_filters(queryset, query_params):
+
+    date_from = parse_day_param(query_params, "date_from")
+    if date_from:
+        queryset = queryset.filter(application_submitted_at__gte=start_of_day(date_from))
+    date_to = parse_day_param(query_params, "date_to")
+    if date_to:
+        queryset = queryset.filter(
+            application_submitted_at__lt=start_of_day(date_to + timedelta(days=1))
+        )
+    return queryset
+
+
+def apply_rollup_filters(queryset, query_params):
+    """
+    The ``apply_filters`` equivalent for ``ApplicantDailyRollup`` rows.
+    """
+
+    return apply_category_filters(apply_rollup_date_filters(queryset, query_params), query_params)
+
+
+def apply_rollup_date_filters(queryset, query_params):
 
-    date_from = query_params.get("date_from")
+    date_from = parse_day_param(query_params, "date_from")
     if date_from:
-        queryset = queryset.filter(application_submitted_at__date__gte=date_from)
-    date_to = query_params.get("date_to")
+        queryset = queryset.filter(day__gte=date_from)
+    date_to = parse_day_param(query_params, "date_to")
     if date_to:
-        queryset = queryset.filter(application_submitted_at__date__lte=date_to)
-
-    status = query_params.get("status")
-    if status and status != "":
-        queryset = queryset.filter(application_status__iexact=status)
-    course = query_params.get("courseName")
-    if course and course != "":
-        queryset = queryset.filter(nd_title__iexact=course)
-    gender = query_params.get("gender")
-    if gender and gender != "":
-        queryset = queryset.filter(gender__iexact=gender)
-
-    region = query_params.get("region")
-    if region and region != "":
-        queryset = queryset.filter(region__iexact=region)
+        queryset = queryset.filter(day__lte=date_to)
+    return queryset
+
+
+def apply_search(queryset, search_query):
+
+    return queryset.filter(search_filter(search_query))
 
+
+def get_filtered_applicants(user, query_params):
+    """
+    Returns the applicants visible to ``user``, narrowed by the dashboard
+    filters and ``search`` in ``query_params`` (a QueryDict or the dict from
+    ``normalized_filter_params``).
+    """
+
+    queryset = apply_filters(get_scoped_applicants(user), query_params)
+    search_query = query_params.get("search")
+    if search_query:
+        queryset = apply_search(queryset, search_query)
     return queryset
 
 
+def summarize_applicants(queryset, count=Count("id")):
+    """
+    Aggregates a filtered applicant queryset in a single grouped scan.
+
+    Rows are grouped on the normalized (gender, status, course) triple; the
+    KPIs and every chart breakdown are then folded from those few groups
+    in Python instead of issuing one COUNT/GROUP BY query per figure.
+    Pass ``count=Sum("applicant_count")`` to summarize rollup rows instead.
+    """
+    return fold_summary(group_for_summary(queryset, count))
+
+
+def group_for_summary(queryset, count=Count("id")):
+
+    return (
+        queryset.values("clean_gender", "clean_status", "clean_course")
+        .annotate(count=count)
+        .order_by()
+    )
+
+
+def fold_summary(rows):
+
+    summary = {
+        "total": 0,
+        "gender": Counter(),
+        "status": Counter(),
+        "course": Counter(),
+    }
+    for row in rows:
+        count = row["count"]
+        summary["total"] += count
+        summary["gender"][row["clean_gender"] or "Unknown"] += count
+        summary["status"][row["clean_status"] or "Unknown"] += count
+        summary["course"][row["clean_course"] or "Unknown"] += count
+    return summary
+
+
+def wants_approx(query_params):
+
+    return str(query_params.get("approx", "")).lower() in ("1", "true", "yes")
+
+
+def summarize_for_user(user, query_params):
+    """
+    Returns ``summarize_exact``, or with ``?approx=true`` the scaled-up
+    ``summarize_sample`` where sampling pays off; otherwise the exact
+    summary is marked as such, with zero margins.
+    """
+    if wants_approx(query_params):
+        summary = summarize_sample(user, query_params)
+        if summary is not None:
+            return summary
+        summary = summarize_exact(user, query_params)
+        summary["margins"] = {
+            "total": 0,
+            **{key: Counter(dict.fromkeys(summary[key], 0)) for key in ("gender", "status", "course")},
+        }
+        summary["approximation"] = {"method": "exact", "samplePercent": 100.0}
+        return summary
+
+    return summarize_exact(user, query_params)
+
+
+def summarize_exact(user, query_params):
+    """
+    Summarizes the applicants visible to ``user`` that match the filters,
+    answering from the daily rollup table unless a free-text ``search``
+    needs raw rows.
+    """
+    search_query = query_params.get("search")
+
+    if search_query:
+        queryset = apply_filters(get_scoped_applicants(user), query_params)
+        return summarize_applicants(apply_search(queryset, search_query))
+
+    queryset = scope_queryset(ApplicantDailyRollup.objects.all(), user)
+    queryset = apply_rollup_filters(queryset, query_params)
+    return summarize_applicants(queryset, count=Sum("applicant_count"))
+
+
+def summarize_sample(user, query_params):
+    """
+    Approximates ``summarize_exact`` on PostgreSQL for exploratory
+    filtering: aggregates a ``TABLESAMPLE`` of about
+    ``ANALYTICS_APPROX_SAMPLE_ROWS`` applicants and scales the counts up,
+    with 95% margins (see ``sampling.scale_summary``), against the
+    planner's row count, which is the total when nothing is filtered.
+    Returns ``None`` on other databases, for tables too small to be worth
+    sampling and for users who see no applicants at all.
+    """
+    if not sampling_supported() or get_region_scope(user) is False:
+        return None
+    table_rows = estimate_table_rows(Applicant)
+    percent = sample_percent(table_rows)
+    if percent >= 100:
+        return None
+
+    queryset = get_filtered_applicants(user, query_params)
+    summary = fold_summary(sampled_rows(group_for_summary(queryset), percent))
+    matched_rows = summary["total"]
+    sample_rows = count_sampled_rows(Applicant, percent)
+    scale_summary(summary, sample_rows, table_rows, percent)
+    summary["approximation"] = {
+        "method": "tablesample",
+        "samplePercent": round(percent, 4),
+        "sampleRows": sample_rows,
+        "matchedRows": matched_rows,
+        "confidence": 0.95,
+    }
+    return summary
+
+
+def summarize_request(request):
+
+    return summarize_for_user(request.user, request.query_params)
+
+
+def get_facet_groups(user, query_params):
+    """
+    Returns the applicant counts visible to ``user`` per combination of the
+    ``CATEGORY_FILTERS`` columns, narrowed by the date filters and
+    ``search`` but not by the category filters themselves: one grouped
+    query, over the daily rollup table unless ``search`` needs raw rows.
+    """
+    search_query = query_params.get("search")
+
+    if search_query:
+        queryset = apply_date_filters(get_scoped_applicants(user), query_params)
+        queryset, count = apply_search(queryset, search_query), Count("id")
+    else:
+        queryset = scope_queryset(ApplicantDailyRollup.objects.all(), user)
+        queryset, count = apply_rollup_date_filters(queryset, query_params), Sum("applicant_count")
+
+    return queryset.values(*CATEGORY_FILTERS.values()).annotate(count=count).order_by()
+
+
+def build_facets(groups, query_params):
+    """
+    Folds ``get_facet_groups`` rows into the option counts of every filter
+    dropdown. As in faceted search, each facet is counted with every filter
+    but its own applied, so its counts are what picking that option would
+    give; a selected option that matches nothing is listed with 0. Blank
+    values, which cannot be filtered on, are left out of the options.
+    """
+    selected = {param: normalize_category(query_params.get(param)) for param in CATEGORY_FILTERS}
+    selected = {param: value for param, value in selected.items() if value}
+    facets = {param: Counter() for param in CATEGORY_FILTERS}
+    total = 0
+
+    for row in groups:
+        failed = [param for param, value in selected.items() if row[CATEGORY_FILTERS[param]] != value]
+        if not failed:
+            total += row["count"]
+        elif len(failed) > 1:
+            continue
+        # A row that fails one filter only counts toward that filter's facet.
+        for param in failed or CATEGORY_FILTERS:
+            value = row[CATEGORY_FILTERS[param]]
+            if value:
+                facets[param][value] += row["count"]
+
+    for param, value in selected.items():
+        facets[param][value] += 0
+
+    return {
+        "total": total,
+        "facets": {
+            param: [
+                {"value": value, "count": count}
+                for value, count in sorted(counts.items(), key=lambda item: (-item[1], item[0]))
+            ]
+            for param, counts in facets.items()
+        },
+    }
+
+
+def count_facets(user, query_params):
+
+    return build_facets(get_facet_groups(user, query_params), query_params)
+
+
+# ?interval= -> truncation of a submission day to the start of its bucket.
+TIMESERIES_TRUNCATIONS = {"day": None, "week": TruncWeek, "month": TruncMonth}
+# Zero-filled buckets in one response, e.g. about five years of days.
+TIMESERIES_MAX_BUCKETS = 2000
+
+
+def parse_interval_param(query_params):
+
+    interval = query_params.get("interval") or "month"
+    if interval not in TIMESERIES_TRUNCATIONS:
+        raise ValidationError({"interval": f"Choose one of: {', '.join(TIMESERIES_TRUNCATIONS)}."})
+    return interval
+
+
+def parse_fill_param(query_params):
+
+    return str(query_params.get("fill", "true")).lower() not in ("0", "false", "no")
+
+
+def bucket_start(day, interval):
+    """
+    The Python side of ``TIMESERIES_TRUNCATIONS``: weeks start on Monday,
+    as with ``TruncWeek``.
+    """
+    if interval == "week":
+        return day - timedelta(days=day.weekday())
+    if interval == "month":
+        return day.replace(day=1)
+    return day
+
+
+def next_bucket(start, interval):
+
+    if interval == "week":
+        return start + timedelta(days=7)
+    if interval == "month":
+        return (start.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return start + timedelta(days=1)
+
+
+def get_timeseries_groups(user, query_params, interval):
+    """
+    Returns the applicant counts visible to ``user`` that match the filters
+    per bucket of submission days and normalized status, in one grouped
+    query over the daily rollup table, or over raw rows when ``search``
+    needs them. Applicants without a submission date come back in a
+    ``None`` bucket.
+    """
+    search_query = query_params.get("search")
+
+    if search_query:
+        queryset = apply_filters(get_scoped_applicants(user), query_params)
+        queryset = apply_search(queryset, search_query)
+        day, count = TruncDate("application_submitted_at"), Count("id")
+    else:
+        queryset = scope_queryset(ApplicantDailyRollup.objects.all(), user)
+        queryset = apply_rollup_filters(queryset, query_params)
+        day, count = F("day"), Sum("applicant_count")
+
+    truncate = TIMESERIES_TRUNCATIONS[interval]
+    return (
+        queryset.annotate(bucket=truncate(day) if truncate else day)
+        .values("bucket", "clean_status")
+        .annotate(count=count)
+        .order_by()
+    )
+
+
+def build_timeseries(groups, query_params, interval, fill=True):
+    """
+    Folds ``get_timeseries_groups`` rows into buckets in date order, each
+    with its total and a count per status (every status listed in every
+    bucket). With ``fill``, buckets without applicants are added as zeros,
+    from ``date_from`` (or the first bucket) to ``date_to`` (or the last),
+    without another query.
+    """
+    buckets = {}
+    statuses = Counter()
+    undated = 0
+    for row in groups:
+        status_name = row["clean_status"] or "Unknown"
+        if row["bucket"] is None:
+            undated += row["count"]
+            continue
+        buckets.setdefault(row["bucket"], Counter())[status_name] += row["count"]
+        statuses[status_name] += row["count"]
+
+    if fill and (buckets or query_params.get("date_from") and query_params.get("date_to")):
+        date_from = parse_day_param(query_params, "date_from")
+        date_to = parse_day_param(query_params, "date_to")
+        start = bucket_start(date_from, interval) if date_from else min(buckets)
+        end = bucket_start(date_to, interval) if date_to else max(buckets)
+        starts = []
+        while start <= end:
+            if len(starts) == TIMESERIES_MAX_BUCKETS:
+                raise ValidationError({
+                    "interval": f"More than {TIMESERIES_MAX_BUCKETS} buckets; "
+                    "use a longer interval or a shorter date range."
+                })
+            starts.append(start)
+            start = next_bucket(start, interval)
+    else:
+        starts = sorted(buckets)
+
+    names = [name for name, _ in sorted(statuses.items(), key=lambda item: (-item[1], item[0]))]
+    series = []
+    for start in starts:
+        counts = buckets.get(start, Counter())
+        series.append(
+            {
+                "start": start.isoformat(),
+                "total": sum(counts.values()),
+                "statuses": {name: counts[name] for name in names},
+            }
+        )
+    return {"interval": interval, "statuses": names, "buckets": series, "undated": undated}
+
+
+def count_timeseries(user, query_params):
+
+    interval = parse_interval_param(query_params)
+    groups = get_timeseries_groups(user, query_params, interval)
+    return build_timeseries(groups, query_params, interval, parse_fill_param(query_params))
+
+
+# Filter dropdowns and the normalized column each lists the distinct values of.
+FILTER_OPTION_SOURCES = {
+    "statuses": "clean_status",
+    "regions": "clean_region",
+    "courses": "clean_course",
+    "genders": "clean_gender",
+}
+
+
+def get_filter_option_values(field):
+    """
+    Returns the sorted distinct non-blank values of the normalized ``field``,
+    the values the category filters match, read from the daily rollup
+    table: it carries every value in use in far fewer rows than
+    ``Applicant``.
+    """
+    return sorted(
+        ApplicantDailyRollup.objects.values_list(field, flat=True)
+        .exclude(**{f"{field}__isnull": True})
+        .exclude(**{field: ""})
+        .order_by()
+        .distinct()
+    )
+
+
+def build_filter_options(values):
+    """
+    Builds the filter-options payload from ``{dropdown: sorted values}``.
+    """
+    return {**values, "completionStatuses": values["statuses"]}
+
+
+def build_kpis(summary):
+
+    total_applicants = summary["total"]
+    active_students = summary["status"]["enrolled"]
+    completed_courses = summary["status"]["closed"]
+    successful_applications = active_students + completed_courses
+
+    enrollment_rate = 0
+    if total_applicants > 0:
+        enrollment_rate = round((successful_applications / total_applicants) * 100)
+
+    kpis = {
+        "totalStudents": total_applicants,
+        "activeStudents": active_students,
+        "completedCourses": completed_courses,
+        "completionRate": enrollment_rate,
+        "courseCategories": {},
+    }
+    if "approximation" in summary:
+        margins = summary["margins"]
+        kpis["approximation"] = summary["approximation"]
+        kpis["margins"] = {
+            "totalStudents": margins["total"],
+            "activeStudents": margins["status"]["enrolled"],
+            "completedCourses": margins["status"]["closed"],
+        }
+    return kpis
+
+
+def build_chart_data(summary):
+
+    margins = summary.get("margins")
+    charts = {
+        key: [
+            {"name": name, "value": value, **({"margin": margins[key][name]} if margins else {})}
+            for name, value in sorted(
+                summary[key].items(), key=lambda item: (-item[1], item[0])
+            )
+        ]
+        for key in ("gender", "status", "course")
+    }
+    if "approximation" in summary:
+        charts["approximation"] = summary["approximation"]
+    return charts
+
+
+def parse_fields_param(query_params):
+    """
+    Returns the ``fields=`` projection (comma separated) as a list of field
+    names, or None when the parameter is absent.
+    """
+    value = query_params.get("fields")
+    if not value:
+        return None
+    fields = list(dict.fromkeys(name.strip() for name in value.split(",") if name.strip()))
+    unknown = [name for name in fields if name not in APPLICANT_FIELDS]
+    if unknown:
+        raise ValidationError({"fields": f"Unknown field(s): {', '.join(unknown)}."})
+    return fields
+
+
 class ApplicantListView(generics.ListAPIView):
     serializer_class = ApplicantSerializer
+    pagination_class = ApplicantCursorPagination
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
-        user = self.request.user
-        queryset = Applicant.objects.all()
-
-        if not user.is_staff:
-            try:
-                user_region = user.userprofile.region
-                queryset = queryset.filter(region=user_region)
-            except UserProfile.DoesNotExist:
-                queryset = Applicant.objects.none()
-        queryset = apply_filters(queryset, self.request.query_params)
-
-        search_query = self.request.query_params.get("search", None)
-        if search_query:
-
-            queryset = queryset.filter(
-                Q(first_name__icontains=search_query)
-                | Q(last_name__icontains=search_query)
-                | Q(email__icontains=search_query)
-                | Q(application_id__icontains=search_query)
+        return get_filtered_applicants(self.request.user, self.request.query_params)
+
+    def list(self, request, *args, **kwargs):
+        fields = parse_fields_param(request.query_params)
+        if fields is None:
+            return super().list(request, *args, **kwargs)
+
+        # Projected pages select only the requested columns (plus the keyset)
+        # and skip the serializer; every field is a plain column.
+        queryset = self.get_queryset().values(
+            *dict.fromkeys([*fields, "id", "application_submitted_at"])
+        )
+        page = self.paginate_queryset(queryset)
+        return self.get_paginated_response(
+            [{name: row[name] for name in fields} for row in page]
+        )
+
+
+class ApplicantSearchView(APIView):
+    """
+    Ranked suggestions for the student search box: the best ``limit``
+    matches for ``q`` within the user's scope and the usual filters.
+    """
+
+    permission_classes = [IsAuthenticated]
+    result_fields = [
+        "id",
+        "application_id",
+        "first_name",
+        "last_name",
+        "email",
+        "region",
+        "application_status",
+        "application_submitted_at",
+    ]
+    default_limit = 10
+    max_limit = 50
+
+    def get(self, request):
+        text = request.query_params.get("q", "").strip()
+        if not text:
+            return Response({"results": []})
+        try:
+            limit = min(int(request.query_params.get("limit", self.default_limit)), self.max_limit)
+        except ValueError:
+            raise ValidationError({"limit": "Enter a whole number."})
+
+        queryset = get_scoped_applicants(request.user)
+        queryset = apply_filters(queryset, request.query_params)
+        results = rank_search(queryset, text).values(*self.result_fields)[: max(limit, 1)]
+        return Response({"results": list(results)})
+
+
+class ApplicantExportView(APIView):
+    """
+    Exports the applicant list with the same scope, filters and ``search``
+    as ``/students/``, in ``?file_format=csv`` (the default) or ``xlsx``.
+
+    GET streams the file straight from a server-side cursor. POST queues
+    the export as an ``ExportJob`` for the ``export_applicants`` task and
+    returns the job to poll.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def get_file_format(self, request):
+        file_format = request.query_params.get("file_format", ExportJob.CSV)
+        if file_format not in CONTENT_TYPES:
+            raise ValidationError({"file_format": f"Choose one of: {', '.join(CONTENT_TYPES)}."})
+        return file_format
+
+    def get(self, request, *args, **kwargs):
+        file_format = self.get_file_format(request)
+        queryset = get_filtered_applicants(request.user, request.query_params)
+        filename = export_filename(file_format)
+
+        if file_format == ExportJob.XLSX:
+            # Workbooks are zip files, so they are built in a temporary file
+            # (openpyxl's write-only mode keeps memory flat) and then streamed.
+            workbook = tempfile.TemporaryFile()
+            write_xlsx(queryset, workbook)
+            workbook.seek(0)
+            return FileResponse(
+                workbook,
+                as_attachment=True,
+                filename=filename,
+                content_type=CONTENT_TYPES[file_format],
             )
 
-        return queryset.order_by("-application_submitted_at")
+        response = StreamingHttpResponse(stream_csv(queryset), content_type=CONTENT_TYPES[file_format])
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
+
+    def post(self, request, *args, **kwargs):
+        job = ExportJob.objects.create(
+            requested_by=request.user,
+            file_format=self.get_file_format(request),
+            params=normalized_filter_params(request.query_params),
+        )
+        export_applicants.delay(job.pk)
+        return Response(
+            ExportJobSerializer(job, context={"request": request}).data,
+            status=status.HTTP_202_ACCEPTED,
+        )
+
+
+def get_visible_export_jobs(user):
+
+    if user.is_staff:
+        return ExportJob.objects.all()
+    return ExportJob.objects.filter(requested_by=user)
+
+
+class ExportJobDetailView(generics.RetrieveAPIView):
+    """
+    Reports the status of a background export; users see their own only.
+    """
+
+    permission_classes = [IsAuthenticated]
+    serializer_class = ExportJobSerializer
+
+    def get_queryset(self):
+        return get_visible_export_jobs(self.request.user)
+
+
+class ExportJobDownloadView(APIView):
+    """
+    Downloads the file written by a finished background export.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, pk, *args, **kwargs):
+        job = get_object_or_404(get_visible_export_jobs(request.user), pk=pk)
+        if job.status != ExportJob.SUCCEEDED or not default_storage.exists(job.file):
+            raise Http404("This export has no file.")
+
+        return FileResponse(
+            default_storage.open(job.file, "rb"),
+            as_attachment=True,
+            filename=export_filename(job.file_format, job.created_at),
+            content_type=CONTENT_TYPES[job.file_format],
+        )
 
 
 class FileUploadView(APIView):
@@ -95,165 +742,190 @@ class FileUploadView(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
+        error = upload_file_error(uploaded_file)
+        if error:
+            return Response(
+                {"success": False, "message": error},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
         file_path = default_storage.save(f"temp/{uploaded_file.name}", uploaded_file)
         full_path = default_storage.path(file_path)
 
-        process_uploaded_file.delay(full_path)
+        job = UploadJob.objects.create(
+            file_name=uploaded_file.name, file_path=full_path, uploaded_by=request.user
+        )
+        process_uploaded_file.delay(job.pk)
 
         return Response(
             {
                 "success": True,
                 "message": "Upload received! Data is being processed in the background.",
+                "job": UploadJobSerializer(job, context={"request": request}).data,
             },
             status=status.HTTP_202_ACCEPTED,
         )
 
 
-class ChartDataView(APIView):
+class UploadJobDetailView(generics.RetrieveAPIView):
     """
-    Provides aggregated data for frontend charts, respecting user region.
+    Reports the progress of a bulk upload: row counts, throughput and ETA.
     """
 
-    permission_classes = [IsAuthenticated]
+    permission_classes = [IsAdminUser]
+    serializer_class = UploadJobSerializer
+    queryset = UploadJob.objects.all()
 
-    def get(self, request, *args, **kwargs):
-        user = self.request.user
-        queryset = Applicant.objects.all()
-
-        if not user.is_staff:
-            try:
-                user_region = user.userprofile.region
-                queryset = queryset.filter(region=user_region)
-            except UserProfile.DoesNotExist:
-                queryset = Applicant.objects.none()
-        queryset = apply_filters(queryset, self.request.query_params)
-        gender_data = (
-            queryset.annotate(clean_gender=Trim(Lower("gender")))
-            .values("clean_gender")
-            .annotate(count=Count("id"))
-        )
 
-        status_data = (
-            queryset.annotate(clean_status=Trim(Lower("application_status")))
-            .values("clean_status")
-            .annotate(count=Count("id"))
-        )
+class UploadJobErrorsView(APIView):
+    """
+    Downloads the rejected-rows report of a finished bulk upload.
+    """
+
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, pk, *args, **kwargs):
+        job = get_object_or_404(UploadJob, pk=pk)
+        if not job.error_report or not default_storage.exists(job.error_report):
+            raise Http404("This upload has no error report.")
 
-        course_data = (
-            queryset.annotate(clean_course=Trim(Lower("nd_title")))
-            .values("clean_course")
-            .annotate(count=Count("id"))
+        return FileResponse(
+            default_storage.open(job.error_report, "rb"),
+            as_attachment=True,
+            filename=f"upload-{job.pk}-errors.csv",
+            content_type="text/csv",
         )
 
-        response_data = {
-            "gender": [
-                {"name": g["clean_gender"] or "Unknown", "value": g["count"]}
-                for g in gender_data
-            ],
-            "status": [
-                {"name": s["clean_status"] or "Unknown", "value": s["count"]}
-                for s in status_data
-            ],
-            "course": [
-                {"name": c["clean_course"] or "Unknown", "value": c["count"]}
-                for c in course_data
-            ],
-        }
-        return Response(response_data)
 
+def analytics_cache_key_parts(scope, query_params):
+
+    parts = {"scope": scope, "filters": normalized_filter_params(query_params)}
+    if wants_approx(query_params):
+        parts["approx"] = True
+    return parts
 
-class KPIView(APIView):
+
+def timeseries_cache_key_parts(scope, query_params):
+
+    return {
+        **analytics_cache_key_parts(scope, query_params),
+        "interval": parse_interval_param(query_params),
+        "fill": parse_fill_param(query_params),
+    }
+
+
+class AnalyticsView(CachedResponseMixin, APIView):
+    """
+    Base class for the cached analytics endpoints. Responses are keyed on
+    the user's region scope, the normalized filter params and ``approx``.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def get_cache_key_parts(self, request):
+
+        return analytics_cache_key_parts(get_region_scope(request.user), request.query_params)
+
+
+class ChartDataView(AnalyticsView):
+    """
+    Provides aggregated data for frontend charts, respecting user region.
+    """
+
+    cache_namespace = "charts"
+
+    def get_payload(self, request):
+
+        return build_chart_data(summarize_request(request))
+
+
+class KPIView(AnalyticsView):
     """
     Provides Key Performance Indicators (KPIs) for the dashboard,
     using specific enrollment statuses for calculations.
     """
 
-    permission_classes = [IsAuthenticated]
+    cache_namespace = "kpis"
 
-    def get(self, request, *args, **kwargs):
-        user = self.request.user
-        queryset = Applicant.objects.all()
+    def get_payload(self, request):
+
+        return build_kpis(summarize_request(request))
 
-        if not user.is_staff:
-            try:
-                user_region = user.userprofile.region
-                queryset = queryset.filter(region=user_region)
-            except UserProfile.DoesNotExist:
-                queryset = queryset.none()
 
-        filtered_queryset = apply_filters(queryset, request.query_params)
+class DashboardView(AnalyticsView):
+    """
+    Returns the KPIs and chart data together, so the dashboard can load
+    both with one request and one aggregation scan.
+    """
+
+    cache_namespace = "dashboard"
+
+    def get_payload(self, request):
+        summary = summarize_request(request)
 
-        total_applicants = filtered_queryset.count()
+        return {"kpis": build_kpis(summary), "charts": build_chart_data(summary)}
 
-        active_students = filtered_queryset.filter(
-            application_status__iexact="enrolled"
-        ).count()
 
-        completed_courses = filtered_queryset.filter(
-            application_status__iexact="closed"
-        ).count()
+class FacetsView(AnalyticsView):
+    """
+    Returns every filter dropdown's options with applicant counts under the
+    current filters and the user's region (see ``build_facets``), so the
+    dashboard can offer only options that match something.
+    """
 
-        successful_applications = active_students + completed_courses
+    cache_namespace = "facets"
 
-        enrollment_rate = 0
-        if total_applicants > 0:
-            enrollment_rate = round((successful_applications / total_applicants) * 100)
+    def get_payload(self, request):
 
-        kpis = {
-            "totalStudents": total_applicants,
-            "activeStudents": active_students,
-            "completedCourses": completed_courses,
-            "completionRate": enrollment_rate,
-            "courseCategories": {},
-        }
-        return Response(kpis)
+        return count_facets(request.user, request.query_params)
+
+
+class TimeseriesView(AnalyticsView):
+    """
+    Returns applicant counts per day, week or month of submission
+    (``?interval=``, default month), split by status, under the dashboard
+    filters; see ``build_timeseries``.
+    """
+
+    cache_namespace = "timeseries"
+
+    def get_cache_key_parts(self, request):
+
+        return timeseries_cache_key_parts(get_region_scope(request.user), request.query_params)
+
+    def get_payload(self, request):
+
+        return count_timeseries(request.user, request.query_params)
 
 
-class FilterOptionsView(APIView):
+class FilterOptionsView(AnalyticsView):
     """
     Provides distinct values for filter dropdowns.
     """
 
-    permission_classes = [IsAuthenticated]
+    cache_namespace = "filter-options"
 
-    def get(self, request, *args, **kwargs):
+    def get_cache_key_parts(self, request):
 
-        statuses = list(
-            Applicant.objects.annotate(clean_name=Trim("application_status"))
-            .values_list("clean_name", flat=True)
-            .distinct()
-            .exclude(clean_name__isnull=True)
-            .exclude(clean_name__exact="")
-        )
-        courses = list(
-            Applicant.objects.annotate(clean_name=Trim("nd_title"))
-            .values_list("clean_name", flat=True)
-            .distinct()
-            .exclude(clean_name__isnull=True)
-            .exclude(clean_name__exact="")
-        )
+        return {}
 
-        genders = list(
-            Applicant.objects.annotate(clean_name=Trim("gender"))
-            .values_list("clean_name", flat=True)
-            .distinct()
-            .exclude(clean_name__isnull=True)
-            .exclude(clean_name__exact="")
-        )
+    def get_payload(self, request):
 
-        regions = list(
-            Applicant.objects.annotate(clean_name=Trim("region"))
-            .values_list("clean_name", flat=True)
-            .distinct()
-            .exclude(clean_name__isnull=True)
-            .exclude(clean_name__exact="")
+        return build_filter_options(
+            {
+                key: get_filter_option_values(field)
+                for key, field in FILTER_OPTION_SOURCES.items()
+            }
         )
 
-        options = {
-            "statuses": sorted(statuses),
-            "regions": sorted(regions),
-            "courses": sorted(courses),
-            "genders": sorted(genders),
-            "completionStatuses": sorted(statuses),
-        }
-        return Response(options)
+
+class CacheStatsView(APIView):
+    """
+    Exposes analytics cache hit/miss counters and the current data version.
+    """
+
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, *args, **kwargs):
+
+        return Response(get_cache_stats())
@@ -5,4 +5,5 @@ class MyappConfig(AppConfig):
     name = 'myapp'
 
     def ready(self):
+        import myapp.instrumentation  # noqa
         import myapp.signals  # noqa
\ No newline at end of file
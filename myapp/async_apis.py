@@ -0,0 +1,225 @@
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.db import close_old_connections
+from django.http import HttpResponse, JsonResponse
+from django.views import View
+from rest_framework import status
+from rest_framework.exceptions import APIException, NotAuthenticated
+
+from .apis import (
+    FILTER_OPTION_SOURCES,
+    analytics_cache_key_parts,
+    build_chart_data,
+    build_filter_options,
+    build_kpis,
+    count_facets,
+    count_timeseries,
+    get_filter_option_values,
+    summarize_for_user,
+    timeseries_cache_key_parts,
+)
+from .authentication import RegionJWTAuthentication
+from .cache import NOT_MODIFIED, lookup_cached_payload, store_payload
+from .scoping import get_region_scope
+
+
+def run_in_thread(func, *args):
+    """
+    Runs the sync ``func`` on a thread of the event loop's default executor
+    (and so on that thread's own database connection), which is closed
+    afterwards if it outlived ``CONN_MAX_AGE``, as at the end of a request.
+    Django's async ORM methods all go through the one thread-sensitive
+    executor, so ``gather()`` over them would still run the queries one at
+    a time.
+    """
+
+    def call():
+        close_old_connections()
+        try:
+            return func(*args)
+        finally:
+            close_old_connections()
+
+    return sync_to_async(call, thread_sensitive=False)()
+
+
+# Cache key -> task building that payload, shared by concurrent misses.
+in_flight = {}
+
+
+async def build_shared(key, build):
+    """
+    Awaits ``build()`` and caches its payload under ``key``. Concurrent
+    misses on the same key in this process share the first one's task
+    instead of each running the same queries.
+    """
+
+    async def build_and_store():
+        payload = await build()
+        await run_in_thread(store_payload, key, payload)
+        return payload
+
+    task = in_flight.get(key)
+    if task is None:
+        task = in_flight[key] = asyncio.ensure_future(build_and_store())
+        task.add_done_callback(lambda _: in_flight.pop(key, None))
+    return await asyncio.shield(task)
+
+
+async def get_cached(namespace, parts, build):
+    """
+    Returns the cached payload for ``namespace`` and ``parts``, building it
+    with ``build_shared`` on a miss.
+    """
+    key, _, cached = await run_in_thread(lookup_cached_payload, namespace, parts)
+    if cached is not None:
+        return cached
+    return await build_shared(key, build)
+
+
+def authenticate(request):
+    """
+    Returns ``(user, region scope)`` for the request's bearer token, the way
+    the DRF views authenticate it.
+    """
+    result = RegionJWTAuthentication().authenticate(request)
+    if result is None:
+        raise NotAuthenticated()
+    user, _ = result
+    return user, get_region_scope(user)
+
+
+class AsyncAnalyticsView(View):
+    """
+    Async counterpart of ``AnalyticsView`` for ASGI workers: same bearer
+    authentication, region scope, cache entries and ETags, but the view
+    awaits its queries instead of holding a worker thread, and runs the
+    independent ones concurrently.
+
+    Subclasses implement ``async get_payload(user, query_params)``.
+    """
+
+    http_method_names = ["get", "head", "options"]
+    cache_namespace = None
+
+    def get_cache_key_parts(self, scope, query_params):
+
+        return analytics_cache_key_parts(scope, query_params)
+
+    async def get_payload(self, user, query_params):
+        raise NotImplementedError
+
+    async def get(self, request, *args, **kwargs):
+        try:
+            user, scope = await run_in_thread(authenticate, request)
+            key, headers, cached = await run_in_thread(
+                lookup_cached_payload,
+                self.cache_namespace,
+                self.get_cache_key_parts(scope, request.GET),
+                request.headers.get("If-None-Match"),
+            )
+            if cached is NOT_MODIFIED:
+                return HttpResponse(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+            if cached is not None:
+                return JsonResponse(cached, headers=headers)
+
+            payload = await build_shared(key, lambda: self.get_payload(user, request.GET))
+        except APIException as exc:
+            return self.error_response(exc)
+
+        return JsonResponse(payload, headers=headers)
+
+    def error_response(self, exc):
+        detail = exc.detail if isinstance(exc.detail, (dict, list)) else {"detail": exc.detail}
+        response = JsonResponse(detail, status=exc.status_code, safe=False)
+        if exc.status_code == status.HTTP_401_UNAUTHORIZED:
+            response["WWW-Authenticate"] = RegionJWTAuthentication().authenticate_header(None)
+        return response
+
+
+async def gather_filter_options():
+
+    values = await asyncio.gather(
+        *(run_in_thread(get_filter_option_values, field) for field in FILTER_OPTION_SOURCES.values())
+    )
+    return build_filter_options(dict(zip(FILTER_OPTION_SOURCES, values)))
+
+
+class AsyncKPIView(AsyncAnalyticsView):
+
+    cache_namespace = "kpis"
+
+    async def get_payload(self, user, query_params):
+
+        return build_kpis(await run_in_thread(summarize_for_user, user, query_params))
+
+
+class AsyncChartDataView(AsyncAnalyticsView):
+
+    cache_namespace = "charts"
+
+    async def get_payload(self, user, query_params):
+
+        return build_chart_data(await run_in_thread(summarize_for_user, user, query_params))
+
+
+class AsyncFacetsView(AsyncAnalyticsView):
+
+    cache_namespace = "facets"
+
+    async def get_payload(self, user, query_params):
+
+        return await run_in_thread(count_facets, user, query_params)
+
+
+class AsyncTimeseriesView(AsyncAnalyticsView):
+
+    cache_namespace = "timeseries"
+
+    def get_cache_key_parts(self, scope, query_params):
+
+        return timeseries_cache_key_parts(scope, query_params)
+
+    async def get_payload(self, user, query_params):
+
+        return await run_in_thread(count_timeseries, user, query_params)
+
+
+class AsyncFilterOptionsView(AsyncAnalyticsView):
+    """
+    Runs the four distinct-value queries concurrently.
+    """
+
+    cache_namespace = "filter-options"
+
+    def get_cache_key_parts(self, scope, query_params):
+
+        return {}
+
+    async def get_payload(self, user, query_params):
+
+        return await gather_filter_options()
+
+
+class AsyncDashboardView(AsyncAnalyticsView):
+    """
+    Everything the dashboard loads, in one request: the KPIs and charts of
+    ``DashboardView`` plus the filter options (through their own, global
+    cache entry), with the summary and the distinct-value queries running
+    concurrently.
+    """
+
+    cache_namespace = "dashboard-bundle"
+
+    async def get_payload(self, user, query_params):
+        summary, filter_options = await asyncio.gather(
+            run_in_thread(summarize_for_user, user, query_params),
+            get_cached(AsyncFilterOptionsView.cache_namespace, {}, gather_filter_options),
+        )
+
+        return {
+            "kpis": build_kpis(summary),
+            "charts": build_chart_data(summary),
+            "filterOptions": filter_options,
+        }
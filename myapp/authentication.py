@@ -0,0 +1,60 @@
+from django.contrib.auth.models import User
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.serializers import (
+    TokenObtainPairSerializer,
+    TokenRefreshSerializer,
+)
+from rest_framework_simplejwt.settings import api_settings
+
+from .scoping import get_profile_region
+
+# Normalized profile region, or false for a user without a profile. Staff
+# tokens carry it too, so a demoted user is scoped by it straight away.
+REGION_CLAIM = "region"
+
+
+class RegionTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """
+    Issues token pairs that embed the user's region scope, so requests
+    authenticated with them need no profile lookup.
+    """
+
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        token[REGION_CLAIM] = get_profile_region(user)
+        return token
+
+
+class RegionTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    Re-reads the profile region on every refresh, so a region change
+    reaches new access tokens within ``ACCESS_TOKEN_LIFETIME``.
+    """
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs["refresh"])
+        user = (
+            User.objects.select_related("userprofile")
+            .filter(**{api_settings.USER_ID_FIELD: refresh[api_settings.USER_ID_CLAIM]})
+            .first()
+        )
+        if user is not None:
+            refresh[REGION_CLAIM] = get_profile_region(user)
+        # The access token is derived from (and copies the claims of) the
+        # refresh token the parent validates, so hand it the updated one.
+        return super().validate({**attrs, "refresh": str(refresh)})
+
+
+class RegionJWTAuthentication(JWTAuthentication):
+    """
+    ``JWTAuthentication`` that exposes the token's region claim as
+    ``user.region_claim`` for ``get_region_scope``. Tokens issued without
+    the claim leave it unset, and scoping falls back to the profile.
+    """
+
+    def get_user(self, validated_token):
+        user = super().get_user(validated_token)
+        if REGION_CLAIM in validated_token:
+            user.region_claim = validated_token[REGION_CLAIM]
+        return user
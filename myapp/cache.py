@@ -0,0 +1,167 @@
+import hashlib
+import json
+import time
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.utils.http import parse_etags, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+DATA_VERSION_KEY = "analytics:data-version"
+STATS_KEY_PREFIX = "analytics:stats:"
+STATS_EVENTS = ("hits", "misses", "not_modified", "oversized")
+# Backends that keep their entries inside one process, where a data version
+# bumped by the Celery worker never reaches the web processes.
+PROCESS_LOCAL_BACKENDS = (LocMemCache, DummyCache)
+
+
+def get_data_version():
+    """
+    Returns the global data version that every cached analytics response is
+    keyed on. Seeded from the clock so that an evicted counter never comes
+    back at a value an older entry was stored under.
+    """
+    version = cache.get(DATA_VERSION_KEY)
+    if version is None:
+        cache.add(DATA_VERSION_KEY, int(time.time() * 1000), timeout=None)
+        version = cache.get(DATA_VERSION_KEY)
+    return version
+
+
+def bump_data_version():
+    """
+    Invalidates every cached analytics response at once. Called whenever
+    the applicant data changes, e.g. at the end of an upload.
+    """
+    try:
+        return cache.incr(DATA_VERSION_KEY)
+    except ValueError:
+        version = int(time.time() * 1000)
+        cache.set(DATA_VERSION_KEY, version, timeout=None)
+        return version
+
+
+def record_cache_event(event):
+
+    key = STATS_KEY_PREFIX + event
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 0, timeout=None)
+        try:
+            cache.incr(key)
+        except ValueError:
+            # DummyCache stores nothing, so there is nothing to count in.
+            pass
+
+
+def get_cache_stats():
+
+    values = cache.get_many([STATS_KEY_PREFIX + event for event in STATS_EVENTS])
+    stats = {event: values.get(STATS_KEY_PREFIX + event, 0) for event in STATS_EVENTS}
+    lookups = stats["hits"] + stats["misses"] + stats["not_modified"]
+    stats["hit_rate"] = (
+        round((stats["hits"] + stats["not_modified"]) / lookups, 4) if lookups else None
+    )
+    stats["data_version"] = get_data_version()
+    return stats
+
+
+def cache_is_shared():
+    """
+    Whether every process sees the same cache, so that a ``bump_data_version``
+    anywhere invalidates the entries (and ETags) of all of them.
+    """
+    return not isinstance(caches["default"], PROCESS_LOCAL_BACKENDS)
+
+
+def build_cache_key(namespace, version, parts):
+
+    digest = hashlib.sha1(
+        json.dumps([namespace, version, parts], sort_keys=True, default=str).encode()
+    ).hexdigest()
+    return f"analytics:{namespace}:{digest}"
+
+
+# Returned by lookup_cached_payload when the client's copy is current.
+NOT_MODIFIED = object()
+
+
+def lookup_cached_payload(namespace, parts, if_none_match=None):
+    """
+    Looks up the cached payload for ``namespace`` and the key ``parts`` at
+    the current data version. Returns ``(key, headers, cached)``: ``cached``
+    is ``NOT_MODIFIED`` when the payload is cached and ``if_none_match``
+    matches its ETag, the stored payload on a hit, and ``None`` on a miss.
+
+    With a process-local cache the data version is never bumped by uploads
+    finished in the worker, so no ETag is sent and no revalidation is
+    answered: a client's copy could otherwise stay current forever.
+    """
+    key = build_cache_key(namespace, get_data_version(), parts)
+    if cache_is_shared():
+        etag = quote_etag(key.rsplit(":", 1)[-1])
+        headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    else:
+        etag = None
+        headers = {"Cache-Control": "private, no-cache"}
+
+    payload = cache.get(key)
+    if payload is None:
+        record_cache_event("misses")
+        return key, headers, None
+
+    if etag and if_none_match:
+        etags = parse_etags(if_none_match)
+        if "*" in etags or etag in etags or f"W/{etag}" in etags:
+            record_cache_event("not_modified")
+            return key, headers, NOT_MODIFIED
+
+    record_cache_event("hits")
+    return key, headers, payload
+
+
+def store_payload(key, payload):
+
+    if len(json.dumps(payload, default=str)) <= settings.ANALYTICS_CACHE_MAX_ENTRY_BYTES:
+        cache.set(key, payload, timeout=settings.ANALYTICS_CACHE_TIMEOUT)
+    else:
+        record_cache_event("oversized")
+
+
+class CachedResponseMixin:
+    """
+    Caches a view's GET payload under its namespace, the current data version
+    and the view's key parts (region scope, normalized params), and answers
+    ``If-None-Match`` revalidations of a cached payload with a 304 without
+    touching the database (only with a shared cache, see
+    ``lookup_cached_payload``).
+
+    Views implement ``get_cache_key_parts(request)`` and ``get_payload(request)``.
+    """
+
+    cache_namespace = None
+
+    def get_cache_key_parts(self, request):
+        raise NotImplementedError
+
+    def get_payload(self, request):
+        raise NotImplementedError
+
+    def get(self, request, *args, **kwargs):
+        key, headers, cached = lookup_cached_payload(
+            self.cache_namespace,
+            self.get_cache_key_parts(request),
+            request.headers.get("If-None-Match"),
+        )
+        if cached is NOT_MODIFIED:
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        if cached is not None:
+            return Response(cached, headers=headers)
+
+        payload = self.get_payload(request)
+        store_payload(key, payload)
+        return Response(payload, headers=headers)
@@ -0,0 +1,378 @@
+import csv
+import io
+import os
+import re
+import zipfile
+from collections import defaultdict
+from datetime import datetime
+from functools import lru_cache
+from itertools import zip_longest
+
+from dateutil.parser import parse
+from django.db import models
+
+from .models import Applicant, normalize_category
+from .xlsx import XlsxReader
+
+UPLOAD_EXTENSIONS = (".csv", ".xlsx")
+# Excel 97-2003 workbooks are OLE2 compound files.
+OLE2_SIGNATURE = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"
+
+
+def normalize_header(value):
+
+    return str(value).strip().lower().replace(" ", "_").replace("?", "")
+
+
+def coerce_datetime(value):
+    """
+    Parses an uploaded datetime cell. Blank, numeric and unparseable values
+    become ``None``; datetime objects (from Excel) pass through unchanged.
+    """
+    if isinstance(value, str):
+        value = value.strip()
+        if not value:
+            return None
+        try:
+            return parse(value)
+        except (ValueError, TypeError, OverflowError):
+            return None
+    if isinstance(value, (int, float)):
+        return None
+    return value
+
+
+ISO_DATETIME = re.compile(
+    r"\d{4}-\d{2}-\d{2}(?:[T ]\d{2}:\d{2}(?::\d{2}(?:\.\d{1,6})?)?(?:Z|[+-]\d{2}:?\d{2})?)?"
+)
+
+# Formats tried when a column is not ISO 8601. Only month-first layouts are
+# listed: they are the ones dateutil's default parse agrees with.
+STRPTIME_FORMATS = (
+    "%m/%d/%Y %H:%M:%S",
+    "%m/%d/%Y %H:%M",
+    "%m/%d/%Y %I:%M:%S %p",
+    "%m/%d/%Y %I:%M %p",
+    "%m/%d/%Y",
+    "%Y/%m/%d %H:%M:%S",
+    "%Y/%m/%d %H:%M",
+    "%Y/%m/%d",
+)
+
+
+def parse_iso(value):
+
+    if ISO_DATETIME.fullmatch(value) is None:
+        raise ValueError(value)
+    return datetime.fromisoformat(value)
+
+
+def make_strptime(fmt):
+
+    def parse_format(value):
+        return datetime.strptime(value, fmt)
+
+    return parse_format
+
+
+DATETIME_FORMATS = [("iso", parse_iso)] + [
+    (fmt, make_strptime(fmt)) for fmt in STRPTIME_FORMATS
+]
+
+
+class DateTimeColumnParser:
+    """
+    Parses the text cells of one datetime column with the same results as
+    ``coerce_datetime``, but through a compiled fast path: the column's
+    format is inferred from the values seen (and re-inferred when it stops
+    matching), and ``dateutil`` only handles values no known format fits.
+    Repeated strings are answered from an LRU memo.
+    """
+
+    def __init__(self, memo_size=4096):
+        self.format = None
+        self.fast_path = None
+        self.fallbacks = 0
+        self.parse_text = lru_cache(maxsize=memo_size)(self._parse_text)
+
+    def __call__(self, value):
+        if isinstance(value, str):
+            value = value.strip()
+            if not value:
+                return None
+            return self.parse_text(value)
+        if isinstance(value, (int, float)):
+            return None
+        return value
+
+    def _parse_text(self, value):
+        if self.fast_path is not None:
+            try:
+                return self.fast_path(value)
+            except ValueError:
+                pass
+
+        for fmt, fast_path in DATETIME_FORMATS:
+            if fast_path is self.fast_path:
+                continue
+            try:
+                parsed = fast_path(value)
+            except ValueError:
+                continue
+            self.format, self.fast_path = fmt, fast_path
+            return parsed
+
+        self.fallbacks += 1
+        return coerce_datetime(value)
+
+
+def make_truncate(max_length):
+
+    def truncate(value):
+        if isinstance(value, str) and len(value) > max_length:
+            return value[:max_length]
+        return value
+
+    truncate.max_length = max_length
+    return truncate
+
+
+def compile_field_coercers():
+    """
+    Returns ``{field name: coerce function or None}`` for every field an
+    upload can populate.
+    """
+    coercers = {}
+    for field in Applicant._meta.concrete_fields:
+        if (
+            field.auto_created
+            or field.name in Applicant.NORMALIZED_FIELDS
+            or field.name in Applicant.TRIGGER_FIELDS
+        ):
+            continue
+        if isinstance(field, models.DateTimeField):
+            coercers[field.name] = DateTimeColumnParser()
+        elif isinstance(field, models.CharField) and field.max_length:
+            coercers[field.name] = make_truncate(field.max_length)
+        else:
+            coercers[field.name] = None
+    return coercers
+
+
+class IngestPlan:
+    """
+    Maps the columns of an upload to ``Applicant`` fields once, from the
+    header row, so each data row is converted with a single pass over the
+    mapped columns and no model introspection.
+
+    Headers match a field by name or by its normalized ``verbose_name``
+    (the questionnaire wording used in the program exports).
+    """
+
+    def __init__(self, headers):
+        coercers = compile_field_coercers()
+        verbose_names = {}
+        for field in Applicant._meta.concrete_fields:
+            if field.name in coercers:
+                verbose_names[normalize_header(field.verbose_name)] = field.name
+
+        normalized = [normalize_header(h) for h in headers]
+        present = set(normalized)
+        columns = {}
+        for index, header in enumerate(normalized):
+            field_name = verbose_names.get(header)
+            if field_name is None or field_name in present:
+                field_name = header if header in coercers else None
+            if field_name is not None:
+                columns[field_name] = index
+
+        self.columns = [
+            (index, field_name, coercers[field_name])
+            for field_name, index in columns.items()
+        ]
+        self.width = len(normalized)
+        self.empty_row = dict.fromkeys(coercers)
+        self.normalized_fields = list(Applicant.NORMALIZED_FIELDS.items())
+        self.issues = []
+
+    def validate_row(self, values):
+        """
+        Returns why a raw row must be rejected, or ``None`` if it can be
+        ingested.
+        """
+        if not any(values):
+            return "empty row"
+        if len(values) > self.width and any(values[self.width:]):
+            return f"row has {len(values)} values but the header has {self.width} columns"
+        return None
+
+    def build_row(self, values):
+        """
+        Converts one raw row (a sequence of cell values) into a dict of
+        ``Applicant`` field values, including the ``clean_*`` columns.
+        Values the coercions had to drop are appended to ``issues`` as
+        ``(field name, raw value)`` pairs.
+        """
+        row = self.empty_row.copy()
+        size = len(values)
+        for index, field_name, coerce in self.columns:
+            if index < size:
+                value = values[index]
+                if coerce is None:
+                    row[field_name] = value
+                    continue
+                coerced = row[field_name] = coerce(value)
+                if coerced is None and value and (not isinstance(value, str) or value.strip()):
+                    self.issues.append((field_name, value))
+
+        for clean_field, source_field in self.normalized_fields:
+            row[clean_field] = normalize_category(row[source_field])
+        return row
+
+    def build_block(self, rows):
+        """
+        Columnar ``build_row`` for a block of raw rows that passed
+        ``validate_row``: transposes the block once, then coerces each mapped
+        column in a single pass and normalizes each categorical column once
+        per distinct value. Returns ``({field name: column values}, issues)``
+        where ``issues`` maps a row's offset in the block to the
+        ``(field name, raw value)`` pairs the coercions had to drop.
+        """
+        count = len(rows)
+        raw_columns = list(zip_longest(*rows))
+        columns = {field_name: [None] * count for field_name in self.empty_row}
+        issues = defaultdict(list)
+        for index, field_name, coerce in self.columns:
+            if index >= len(raw_columns):
+                continue
+            raw = raw_columns[index]
+            if coerce is None:
+                columns[field_name] = list(raw)
+                continue
+            max_length = getattr(coerce, "max_length", None)
+            if max_length is not None:
+                # Truncation never drops a value, so there is nothing to report.
+                columns[field_name] = [
+                    value[:max_length] if type(value) is str and len(value) > max_length else value
+                    for value in raw
+                ]
+                continue
+            coerced = columns[field_name] = list(map(coerce, raw))
+            for offset in [offset for offset, value in enumerate(coerced) if value is None]:
+                value = raw[offset]
+                if value and (not isinstance(value, str) or value.strip()):
+                    issues[offset].append((field_name, value))
+
+        for clean_field, source_field in self.normalized_fields:
+            source = columns[source_field]
+            normalized = {value: normalize_category(value) for value in set(source) if type(value) is str}
+            columns[clean_field] = [
+                normalized[value] if type(value) is str else normalize_category(value)
+                for value in source
+            ]
+        return columns, issues
+
+
+def read_csv_header(file_path):
+
+    with open(file_path, newline="", encoding="utf-8") as f:
+        return next(csv.reader(f), [])
+
+
+def read_excel_header(reader):
+    """
+    Returns the header row of an ``XlsxReader``'s sheet up to its last
+    non-blank cell. Rows come padded to the sheet's declared width, which
+    any stray cell past the header widens, and ``IngestPlan`` must reject
+    rows with values beyond the header itself.
+    """
+    header = list(next(reader.iter_rows(max_row=1), ()))
+    while header and (header[-1] is None or not str(header[-1]).strip()):
+        header.pop()
+    return header
+
+
+def split_csv(file_path, chunk_bytes):
+    """
+    Splits a CSV upload into ``(start, end, first_row)`` byte ranges of
+    roughly ``chunk_bytes`` that start and end on row boundaries, skipping
+    the header row. Quote parity is tracked per line, so a newline inside a
+    quoted field never ends a range. Also returns the number of data rows.
+    """
+    ranges = []
+    position = 0
+    start = None
+    in_quotes = False
+    row_number = 0
+    first_row = 2
+    with open(file_path, "rb") as f:
+        for line in f:
+            position += len(line)
+            if line.count(b'"') % 2:
+                in_quotes = not in_quotes
+            if in_quotes:
+                continue
+            row_number += 1
+            if start is None:
+                start = position
+            elif position - start >= chunk_bytes:
+                ranges.append((start, position, first_row))
+                start = position
+                first_row = row_number + 1
+
+    if start is not None and position > start:
+        ranges.append((start, position, first_row))
+    return ranges, max(row_number - 1, 0)
+
+
+def read_csv_rows(file_path, start, end):
+    """
+    Returns a ``csv.reader`` over the rows in the byte range ``[start, end)``.
+    """
+    with open(file_path, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start).decode("utf-8")
+    return csv.reader(io.StringIO(data, newline=""))
+
+
+def split_excel(file_path, chunk_rows):
+    """
+    Splits the active sheet of an XLSX upload into
+    ``(min_row, max_row, first_row)`` ranges below the header row. The last
+    range is open-ended, so a sheet whose stored dimensions are stale is
+    still read to the end. Also returns the row count the sheet declares,
+    or ``None`` if it declares no dimensions; the sheet is then read as one
+    range.
+    """
+    with XlsxReader(file_path) as reader:
+        last_row = reader.max_row
+
+    ranges = []
+    min_row = 2
+    while last_row is not None and min_row + chunk_rows <= last_row:
+        ranges.append((min_row, min_row + chunk_rows - 1, min_row))
+        min_row += chunk_rows
+    ranges.append((min_row, None, min_row))
+    return ranges, None if last_row is None else max(last_row - 1, 0)
+
+
+def upload_file_error(uploaded_file):
+    """
+    Returns why an uploaded file cannot be ingested, or ``None``. Only CSV
+    and XLSX are read; ``.xls`` workbooks, including ones renamed to
+    ``.xlsx``, are turned away before they are queued.
+    """
+    _, ext = os.path.splitext(uploaded_file.name.lower())
+    if ext == ".xls":
+        return "Excel 97-2003 (.xls) workbooks are not supported; save the file as .xlsx or CSV."
+    if ext not in UPLOAD_EXTENSIONS:
+        return "Only CSV and Excel (.xlsx) files can be uploaded."
+    if ext == ".xlsx" and not zipfile.is_zipfile(uploaded_file):
+        uploaded_file.seek(0)
+        signature = uploaded_file.read(len(OLE2_SIGNATURE))
+        uploaded_file.seek(0)
+        if signature == OLE2_SIGNATURE:
+            return "This is an Excel 97-2003 (.xls) workbook; save it as .xlsx or CSV."
+        return "This file is not a valid Excel (.xlsx) workbook."
+    uploaded_file.seek(0)
+    return None
@@ -0,0 +1,266 @@
+import json
+import logging
+import random
+import threading
+import time
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from celery.signals import task_postrun, task_prerun
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+from rest_framework.exceptions import ValidationError
+
+logger = logging.getLogger(__name__)
+
+# Celery tasks whose database use is logged while metrics are on, with the
+# position of their job id argument.
+INSTRUMENTED_TASKS = {
+    "myapp.tasks.process_uploaded_file": 0,
+    "myapp.tasks.process_upload_chunk": 0,
+    "myapp.tasks.finalize_upload": 1,
+    "myapp.tasks.export_applicants": 0,
+}
+
+
+def metrics_enabled():
+
+    return settings.METRICS_SAMPLE_RATE > 0
+
+
+def milliseconds(seconds):
+
+    return round(seconds * 1000, 1)
+
+
+class QueryMetrics:
+    """
+    A ``connection.execute_wrapper`` that counts the queries it wraps and
+    the time spent in them. It may wrap the connections of several threads
+    at once, so time spent in concurrent queries adds up.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.lock = threading.Lock()
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - started
+            with self.lock:
+                self.db_seconds += elapsed
+                self.queries += 1
+
+    def as_dict(self):
+        return {
+            "queries": self.queries,
+            "db_ms": milliseconds(self.db_seconds),
+            "total_ms": milliseconds(time.perf_counter() - self.started),
+        }
+
+
+class RequestMetrics(QueryMetrics):
+    """
+    ``QueryMetrics`` for one request, split into the view (including
+    serializers) and the rendering of the response body.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.view_started = None
+        self.view_finished = None
+
+    def as_dict(self):
+        metrics = super().as_dict()
+        if self.view_started is not None:
+            view_finished = self.view_finished or time.perf_counter()
+            metrics["view_ms"] = milliseconds(view_finished - self.view_started)
+            if self.view_finished is not None:
+                metrics["render_ms"] = milliseconds(time.perf_counter() - self.view_finished)
+        return metrics
+
+    def server_timing(self, metrics):
+        entries = [f'db;dur={metrics["db_ms"]};desc="{metrics["queries"]} queries"']
+        for name in ("view", "render", "total"):
+            if f"{name}_ms" in metrics:
+                entries.append(f'{name};dur={metrics[f"{name}_ms"]}')
+        return ", ".join(entries)
+
+
+# The RequestMetrics of the sampled request being handled. Context variables
+# follow the request into sync_to_async threads: Django's adapter for sync
+# views under ASGI and the async views' ``run_in_thread`` workers.
+current_request_metrics = ContextVar("current_request_metrics", default=None)
+
+
+def record_request_query(execute, sql, params, many, context):
+
+    metrics = current_request_metrics.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    return metrics(execute, sql, params, many, context)
+
+
+def instrument_connection(conn):
+
+    if record_request_query not in conn.execute_wrappers:
+        conn.execute_wrappers.append(record_request_query)
+
+
+@receiver(connection_created)
+def instrument_new_connection(sender, connection, **kwargs):
+    # Each thread has its own connection; this reaches the ones opened on
+    # threads the middleware never runs on.
+    if metrics_enabled():
+        instrument_connection(connection)
+
+
+class RequestMetricsMiddleware:
+    """
+    Times a sample of requests (``METRICS_SAMPLE_RATE``): queries and time
+    spent in the database, the view and rendering, reported in a
+    ``Server-Timing`` header. Requests slower than ``METRICS_SLOW_REQUEST_MS``
+    are logged as a JSON line with their normalized dashboard filters.
+
+    Queries are counted on every thread the request's context reaches
+    (``current_request_metrics``), including the async views' concurrent
+    worker threads, so ``db`` can exceed ``total``. A payload that
+    ``build_shared`` builds once for several requests is counted on the
+    request that started it. With a sample rate of 0 the middleware removes
+    itself.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not metrics_enabled():
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+        self.sample_rate = settings.METRICS_SAMPLE_RATE
+        self.slow_ms = settings.METRICS_SLOW_REQUEST_MS
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+            # Coroutine hooks too, or Django calls them through a thread.
+            self.process_view = self.aprocess_view
+            self.process_template_response = self.aprocess_template_response
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if random.random() >= self.sample_rate:
+            return self.get_response(request)
+
+        metrics = request.metrics = RequestMetrics()
+        instrument_connection(connection)
+        token = current_request_metrics.set(metrics)
+        try:
+            response = self.get_response(request)
+        finally:
+            current_request_metrics.reset(token)
+
+        values = self.add_server_timing(response, metrics)
+        if values["total_ms"] >= self.slow_ms:
+            self.log_slow_request(request, response, values)
+        return response
+
+    async def __acall__(self, request):
+        if random.random() >= self.sample_rate:
+            return await self.get_response(request)
+
+        metrics = request.metrics = RequestMetrics()
+        token = current_request_metrics.set(metrics)
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_request_metrics.reset(token)
+
+        values = self.add_server_timing(response, metrics)
+        if values["total_ms"] >= self.slow_ms:
+            # Reading request.user may query the session.
+            await sync_to_async(self.log_slow_request)(request, response, values)
+        return response
+
+    def add_server_timing(self, response, metrics):
+
+        values = metrics.as_dict()
+        response["Server-Timing"] = metrics.server_timing(values)
+        return values
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        metrics = getattr(request, "metrics", None)
+        if metrics is not None:
+            metrics.view_started = time.perf_counter()
+
+    def process_template_response(self, request, response):
+        # Runs after the view returns and before the response is rendered.
+        metrics = getattr(request, "metrics", None)
+        if metrics is not None:
+            metrics.view_finished = time.perf_counter()
+        return response
+
+    async def aprocess_view(self, request, view_func, view_args, view_kwargs):
+        return RequestMetricsMiddleware.process_view(self, request, view_func, view_args, view_kwargs)
+
+    async def aprocess_template_response(self, request, response):
+        return RequestMetricsMiddleware.process_template_response(self, request, response)
+
+    def log_slow_request(self, request, response, values):
+        from .apis import normalized_filter_params
+
+        try:
+            filters = normalized_filter_params(request.GET)
+        except ValidationError:
+            filters = None
+        match = request.resolver_match
+        line = {
+            "method": request.method,
+            "path": request.path,
+            "view": match.view_name if match else None,
+            "status": response.status_code,
+            "user": getattr(request.user, "pk", None) if hasattr(request, "user") else None,
+            "filters": filters,
+            **values,
+        }
+        logger.warning("slow request %s", json.dumps(line, default=str))
+
+
+# Task id -> QueryMetrics of the instrumented tasks running in this worker.
+running_tasks = {}
+
+
+@task_prerun.connect
+def start_task_metrics(task_id=None, task=None, **kwargs):
+    if not metrics_enabled() or task.name not in INSTRUMENTED_TASKS:
+        return
+    metrics = running_tasks[task_id] = QueryMetrics()
+    connection.execute_wrappers.append(metrics)
+
+
+@task_postrun.connect
+def log_task_metrics(task_id=None, task=None, args=None, retval=None, state=None, **kwargs):
+    metrics = running_tasks.pop(task_id, None)
+    if metrics is None:
+        return
+    if metrics in connection.execute_wrappers:
+        connection.execute_wrappers.remove(metrics)
+
+    job_arg = INSTRUMENTED_TASKS[task.name]
+    line = {
+        "task": task.name,
+        "id": task_id,
+        "job": args[job_arg] if args and len(args) > job_arg else None,
+        "state": state,
+        **metrics.as_dict(),
+    }
+    if isinstance(retval, dict) and "rows" in retval:
+        line["rows"] = retval["rows"]
+    logger.info("task metrics %s", json.dumps(line, default=str))
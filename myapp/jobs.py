@@ -0,0 +1,117 @@
+import csv
+import os
+import time
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db.models import F
+
+from .models import UploadJob
+
+REPORT_HEADER = ["row", "column", "value", "error"]
+REPORT_VALUE_LENGTH = 200
+
+
+def report_dir(job_id):
+
+    return f"upload_reports/{job_id}"
+
+
+class UploadProgress:
+    """
+    Tracks one chunk of an upload: counts rows, records rejected rows and
+    dropped values, and pushes the counters to its ``UploadJob`` as atomic
+    increments, at most once every ``interval`` seconds.
+    """
+
+    def __init__(self, job_id, writer, first_row, interval=2.0):
+        self.job_id = job_id
+        self.writer = writer
+        self.first_row = first_row
+        self.interval = interval
+        self.counts = {
+            "rows_read": 0,
+            "rows_inserted": 0,
+            "rows_updated": 0,
+            "rows_unchanged": 0,
+            "rows_rejected": 0,
+            "rows_with_warnings": 0,
+        }
+        self.reported = dict(self.counts)
+        self.last_flush = time.monotonic()
+        self.issues = []
+
+    def row_read(self):
+        self.counts["rows_read"] += 1
+        if (
+            self.counts["rows_read"] % 1000 == 0
+            and time.monotonic() - self.last_flush >= self.interval
+        ):
+            self.flush()
+
+    def block_read(self, count):
+        self.counts["rows_read"] += count
+        if time.monotonic() - self.last_flush >= self.interval:
+            self.flush()
+
+    def reject(self, row_number, values, reason):
+        self.counts["rows_rejected"] += 1
+        raw = ",".join("" if value is None else str(value) for value in values)
+        self.record(row_number, "", raw, reason)
+
+    def warn(self, row_number, dropped):
+        self.counts["rows_with_warnings"] += 1
+        for field_name, value in dropped:
+            self.record(row_number, field_name, value, "unparseable value, stored as empty")
+
+    def record(self, row_number, column, value, error):
+        if len(self.issues) < settings.INGEST_MAX_REPORTED_ISSUES:
+            self.issues.append([row_number, column, str(value)[:REPORT_VALUE_LENGTH], error])
+
+    def flush(self):
+        for outcome, count in self.writer.counts.items():
+            self.counts[f"rows_{outcome}"] = count
+        changes = {
+            name: F(name) + value - self.reported[name]
+            for name, value in self.counts.items()
+            if value != self.reported[name]
+        }
+        if changes:
+            UploadJob.objects.filter(pk=self.job_id).update(**changes)
+        self.reported = dict(self.counts)
+        self.last_flush = time.monotonic()
+
+    def close(self):
+        """
+        Flushes the final counts and writes this chunk's part of the error
+        report. Returns the part's storage name, or ``None`` if clean.
+        """
+        self.flush()
+        if not self.issues:
+            return None
+
+        name = f"{report_dir(self.job_id)}/part-{self.first_row:012d}.csv"
+        path = default_storage.path(name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            csv.writer(f).writerows(self.issues)
+        return name
+
+
+def merge_error_report(job_id, parts):
+    """
+    Concatenates the chunk report parts (in row order) into the job's
+    downloadable error report and removes the parts.
+    """
+    parts = sorted(part for part in parts if part)
+    if not parts:
+        return None
+
+    name = f"{report_dir(job_id)}/errors.csv"
+    with open(default_storage.path(name), "w", newline="", encoding="utf-8") as report:
+        csv.writer(report).writerow(REPORT_HEADER)
+        for part in parts:
+            with open(default_storage.path(part), newline="", encoding="utf-8") as f:
+                report.write(f.read())
+            default_storage.delete(part)
+    return name
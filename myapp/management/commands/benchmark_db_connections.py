@@ -0,0 +1,96 @@
+import threading
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, close_old_connections, connections
+from django.test import Client
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import RefreshToken
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare API requests/sec with a new database connection per request and '
+        'with the configured persistent connections.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=500, help='Requests per run.')
+        parser.add_argument('--concurrency', type=int, default=4, help='Client threads.')
+        parser.add_argument('--path', default=None, help='API path to request (default: the student list).')
+        parser.add_argument('--username', default=None, help='User to authenticate as (default: first superuser).')
+        parser.add_argument('--host', default='localhost', help='Host header; must be in ALLOWED_HOSTS.')
+
+    def handle(self, *args, **options):
+        user = self.get_user(options['username'])
+        token = str(RefreshToken.for_user(user).access_token)
+        path = options['path'] or reverse('applicant-list')
+        headers = {'authorization': f'Bearer {token}', 'host': options['host']}
+
+        db_settings = connections.settings[DEFAULT_DB_ALIAS]
+        configured = dict(db_settings)
+        per_request = {'CONN_MAX_AGE': 0}
+        label = f"persistent (CONN_MAX_AGE={db_settings['CONN_MAX_AGE']})"
+
+        # Warm up imports, URL resolution and caches outside the timed runs.
+        Client(headers=headers).get(path)
+
+        results = {}
+        for name, overrides in (('new connection per request', per_request), (label, {})):
+            connections.close_all()
+            db_settings.update(configured, **overrides)
+            try:
+                results[name] = self.run(path, headers, options['requests'], options['concurrency'])
+            finally:
+                connections.close_all()
+                db_settings.update(configured)
+            self.stdout.write(f"{name}: {results[name]:.1f} requests/s")
+
+        baseline, tuned = results.values()
+        self.stdout.write(self.style.SUCCESS(
+            f"Speedup: {tuned / baseline:.2f}x over {options['requests']} requests "
+            f"with {options['concurrency']} threads."
+        ))
+
+    def get_user(self, username):
+        users = get_user_model().objects.filter(is_active=True)
+        user = users.filter(username=username).first() if username else users.filter(is_superuser=True).first()
+        if user is None:
+            raise CommandError('No such active user; pass --username.')
+        return user
+
+    def run(self, path, headers, total, concurrency):
+        """
+        Sends ``total`` GET requests to ``path`` from ``concurrency`` threads,
+        each with its own client and so its own connection; returns requests
+        per second. The test client skips ``close_old_connections`` on
+        ``request_started``/``request_finished``, so it is called here around
+        each request, as the WSGI handler does.
+        """
+        failures = []
+
+        def worker(count):
+            client = Client(headers=headers)
+            try:
+                for _ in range(count):
+                    close_old_connections()
+                    response = client.get(path)
+                    close_old_connections()
+                    if response.status_code != 200:
+                        failures.append(response.status_code)
+            finally:
+                connections.close_all()
+
+        shares = [total // concurrency + (i < total % concurrency) for i in range(concurrency)]
+        threads = [threading.Thread(target=worker, args=(share,)) for share in shares]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        if failures:
+            raise CommandError(f'{len(failures)} requests failed (status {failures[0]}).')
+        return total / elapsed
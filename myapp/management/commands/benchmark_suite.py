@@ -0,0 +1,208 @@
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import time
+from statistics import mean, median
+
+import django
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections, connection
+from django.test import Client, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import RefreshToken
+from myapp.cache import bump_data_version
+from myapp.models import Applicant, UploadJob
+from myapp.rollups import rebuild_rollups
+from myapp.synthetic import write_upload
+from myapp.tasks import process_uploaded_file
+
+# (name, URL name, query params, served from the analytics cache)
+ENDPOINTS = [
+    ("kpis", "kpis", {}, True),
+    ("kpis-filtered", "kpis", {"status": "enrolled", "date_from": "2024-01-01"}, True),
+    ("charts", "charts", {}, True),
+    ("dashboard", "dashboard", {}, True),
+    ("filter-options", "filter-options", {}, True),
+    ("facets", "facets", {}, True),
+    ("facets-filtered", "facets", {"status": "enrolled", "region": "oromia"}, True),
+    ("timeseries", "timeseries", {"interval": "month"}, True),
+    ("timeseries-daily", "timeseries", {"interval": "day", "date_from": "2024-01-01"}, True),
+    ("students", "applicant-list", {}, False),
+    ("students-filtered", "applicant-list", {"region": "oromia", "count": "approx"}, False),
+    ("students-search", "applicant-search", {"q": "abebe"}, False),
+]
+BENCHMARK_PREFIX = "BENCH-"
+
+
+def percentile(values, fraction):
+    # Nearest-rank percentile of a non-empty list.
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def summarize_timings(timings):
+
+    return {
+        "runs": len(timings),
+        "min_ms": round(min(timings), 2),
+        "median_ms": round(median(timings), 2),
+        "mean_ms": round(mean(timings), 2),
+        "p95_ms": round(percentile(timings, 0.95), 2),
+    }
+
+
+def git_commit():
+
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=settings.BASE_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class Command(BaseCommand):
+    help = (
+        'Time the dashboard API endpoints and the upload ingest paths against the '
+        'current database and write the results as JSON, for comparing commits.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', default='-', help='JSON file to write; "-" for stdout.')
+        parser.add_argument('--repeat', type=int, default=5, help='Timed requests per endpoint and mode.')
+        parser.add_argument('--username', default=None, help='User to authenticate as (default: first superuser).')
+        parser.add_argument('--host', default='localhost', help='Host header; must be in ALLOWED_HOSTS.')
+        parser.add_argument('--ingest-rows', type=int, default=20000, help='Rows per synthetic upload.')
+        parser.add_argument('--skip-api', action='store_true', help='Do not time the API endpoints.')
+        parser.add_argument('--skip-ingest', action='store_true', help='Do not time the ingest paths.')
+        parser.add_argument('--label', default='', help='Free-form label stored with the results.')
+
+    def handle(self, *args, **options):
+        results = {
+            "label": options['label'],
+            "commit": git_commit(),
+            "recorded_at": timezone.now().isoformat(),
+            "database": connection.vendor,
+            "django": django.get_version(),
+            "python": platform.python_version(),
+            "applicants": Applicant.objects.count(),
+            "repeat": options['repeat'],
+        }
+        if not options['skip_api']:
+            results["endpoints"] = self.time_endpoints(options)
+        if not options['skip_ingest']:
+            results["ingest"] = self.time_ingest(options['ingest_rows'])
+
+        output = json.dumps(results, indent=2)
+        if options['output'] == '-':
+            self.stdout.write(output)
+        else:
+            with open(options['output'], 'w') as file:
+                file.write(output + "\n")
+            self.stderr.write(self.style.SUCCESS(f"Wrote {options['output']}."))
+
+    def get_client(self, options):
+        users = get_user_model().objects.filter(is_active=True)
+        if options['username']:
+            user = users.filter(username=options['username']).first()
+        else:
+            user = users.filter(is_superuser=True).first()
+        if user is None:
+            raise CommandError('No such active user; pass --username.')
+        token = str(RefreshToken.for_user(user).access_token)
+        return Client(headers={'authorization': f'Bearer {token}', 'host': options['host']})
+
+    def time_request(self, client, path, params):
+
+        close_old_connections()
+        started = time.perf_counter()
+        response = client.get(path, params)
+        elapsed = (time.perf_counter() - started) * 1000
+        close_old_connections()
+        if response.status_code != 200:
+            raise CommandError(f"GET {path} returned {response.status_code}.")
+        return elapsed, len(response.content)
+
+    def time_endpoints(self, options):
+        """
+        Times each endpoint ``repeat`` times. Cached analytics endpoints are
+        timed cold (the data version is bumped before each request, as after
+        an upload) and warm (served from the cache).
+        """
+        client = self.get_client(options)
+        results = []
+        for name, url_name, params, cached in ENDPOINTS:
+            path = reverse(url_name)
+            entry = {"name": name, "path": path, "params": params}
+            modes = ("cold", "warm") if cached else ("uncached",)
+            for mode in modes:
+                if mode == "warm":
+                    self.time_request(client, path, params)
+                timings = []
+                for _ in range(options['repeat']):
+                    if mode == "cold":
+                        bump_data_version()
+                    elapsed, entry["bytes"] = self.time_request(client, path, params)
+                    timings.append(elapsed)
+                entry[mode] = summarize_timings(timings)
+            results.append(entry)
+            self.stderr.write(f"{name}: {entry[modes[0]]['median_ms']} ms median ({modes[0]})")
+        return results
+
+    def time_ingest(self, rows):
+        """
+        Runs ``process_uploaded_file`` inline on a synthetic CSV and XLSX
+        upload with each writer available on this database, once into an
+        empty key range and once more with the same file (every row
+        unchanged). The uploaded rows are deleted afterwards.
+        """
+        writers = ["copy", "bulk_create"] if connection.vendor == "postgresql" else ["bulk_create"]
+        results = []
+        try:
+            with tempfile.TemporaryDirectory() as directory:
+                for file_format in ("csv", "xlsx"):
+                    for writer in writers:
+                        Applicant.objects.filter(application_id__startswith=BENCHMARK_PREFIX).delete()
+                        for run in ("insert", "reupload"):
+                            path = os.path.join(directory, f"upload.{file_format}")
+                            write_upload(path, rows, prefix=BENCHMARK_PREFIX)
+                            entry = {"format": file_format, "writer": writer, "run": run, "rows": rows}
+                            entry.update(self.run_upload(path, writer == "copy"))
+                            results.append(entry)
+                            self.stderr.write(
+                                f"ingest {file_format}/{writer}/{run}: {entry['rows_per_second']} rows/s"
+                            )
+        finally:
+            Applicant.objects.filter(application_id__startswith=BENCHMARK_PREFIX).delete()
+            rebuild_rollups()
+            bump_data_version()
+        return results
+
+    def run_upload(self, path, use_copy):
+        # Single-chunk settings keep the whole upload inline in this process.
+        job = UploadJob.objects.create(file_name=os.path.basename(path), file_path=path)
+        with override_settings(
+            INGEST_USE_COPY=use_copy,
+            INGEST_CHUNK_BYTES=2**62,
+            INGEST_CHUNK_ROWS=2**62,
+        ):
+            started = time.perf_counter()
+            totals = process_uploaded_file(job.pk)
+            seconds = time.perf_counter() - started
+        job.delete()
+        return {
+            "seconds": round(seconds, 3),
+            "rows_per_second": round(totals["rows"] / seconds) if seconds else None,
+            # Parsing and writing only, without splitting and the rollup refresh.
+            "writer_rows_per_second": totals["rows_per_second"],
+            **{outcome: totals[outcome] for outcome in ("inserted", "updated", "unchanged")},
+        }
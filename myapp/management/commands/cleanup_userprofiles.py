@@ -1,24 +1,44 @@
-
 from django.core.management.base import BaseCommand
-from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import Count, Min
 from myapp.models import UserProfile
-from collections import defaultdict
 
 class Command(BaseCommand):
-    help = 'Remove duplicate UserProfile entries and retain only one per user.'
+    help = (
+        'Remove duplicate UserProfile entries and retain only the oldest one per user. '
+        'UserProfile.user is a OneToOneField, so its unique index keeps new duplicates out; '
+        'this is for databases restored from before that index existed.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Report duplicates without deleting them.')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Profiles deleted per DELETE statement.')
 
     def handle(self, *args, **kwargs):
-        duplicates = defaultdict(list)
-        for profile in UserProfile.objects.all():
-            duplicates[profile.user_id].append(profile)
+        duplicated = (
+            UserProfile.objects.values('user_id')
+            .annotate(copies=Count('id'), keep=Min('id'))
+            .filter(copies__gt=1)
+            .order_by('user_id')
+        )
+        extra = (
+            UserProfile.objects.filter(user_id__in=duplicated.values('user_id'))
+            .exclude(id__in=duplicated.values('keep'))
+            .order_by('id')
+        )
+
+        if kwargs['dry_run']:
+            for row in duplicated.iterator():
+                self.stdout.write(f"Duplicate profiles for user_id={row['user_id']}: {row['copies']}")
+            self.stdout.write(self.style.SUCCESS(f"Would remove {extra.count()} duplicate UserProfiles."))
+            return
 
+        # Each batch re-runs the GROUP BY rather than deleting from the table
+        # under an open cursor.
         total_removed = 0
-        for user_id, profiles in duplicates.items():
-            if len(profiles) > 1:
-                self.stdout.write(f"Duplicate profiles for user_id={user_id}: {len(profiles)}")
-                # Keep the first, delete the rest
-                for profile in profiles[1:]:
-                    profile.delete()
-                    total_removed += 1
+        with transaction.atomic():
+            while ids := list(extra.values_list('id', flat=True)[:kwargs['batch_size']]):
+                removed, _ = UserProfile.objects.filter(id__in=ids).delete()
+                total_removed += removed
 
         self.stdout.write(self.style.SUCCESS(f"Removed {total_removed} duplicate UserProfiles."))
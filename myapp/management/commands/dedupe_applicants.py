@@ -0,0 +1,48 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Subquery
+from myapp.cache import bump_data_version
+from myapp.models import Applicant
+from myapp.rollups import rebuild_rollups
+
+class Command(BaseCommand):
+    help = (
+        'Remove duplicate Applicant rows and retain the most recently updated one per '
+        'application_id. Migration 0005 runs the same cleanup before adding the unique key.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Report duplicates without deleting them.')
+
+    def handle(self, *args, **kwargs):
+        duplicated = (
+            Applicant.objects.filter(application_id__gt='')
+            .values('application_id')
+            .annotate(copies=Count('id'))
+            .filter(copies__gt=1)
+            .order_by('application_id')
+        )
+        keeper = (
+            Applicant.objects.filter(application_id=OuterRef('application_id'))
+            .order_by(F('applicant_updated_at').desc(nulls_last=True), '-id')
+            .values('id')[:1]
+        )
+        extra = (
+            Applicant.objects.filter(application_id__in=duplicated.values('application_id'))
+            .exclude(id=Subquery(keeper))
+        )
+
+        if kwargs['dry_run']:
+            for row in duplicated[:20]:
+                self.stdout.write(f"Duplicate applicants for application_id={row['application_id']}: {row['copies']}")
+            self.stdout.write(self.style.SUCCESS(f"Would remove {extra.count()} duplicate Applicants."))
+            return
+
+        with transaction.atomic():
+            total_removed, _ = extra.delete()
+            if total_removed:
+                rebuild_rollups()
+        if total_removed:
+            bump_data_version()
+
+        self.stdout.write(self.style.SUCCESS(f"Removed {total_removed} duplicate Applicants."))
@@ -0,0 +1,101 @@
+import csv
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from myapp.models import UserProfile
+
+REQUIRED_COLUMNS = ('username', 'region')
+OPTIONAL_COLUMNS = ('email', 'first_name', 'last_name', 'password')
+
+class Command(BaseCommand):
+    help = (
+        'Provision regional coordinators from a CSV file with username and region columns '
+        '(optionally email, first_name, last_name and password). New users and their profiles '
+        'are created with bulk_create; existing users get their profile region updated.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('csv_file', help='CSV file with a header row.')
+        parser.add_argument('--dry-run', action='store_true', help='Validate the file and report without writing.')
+
+    def handle(self, *args, **kwargs):
+        rows = self.read_rows(kwargs['csv_file'])
+        existing = {
+            user.username: user
+            for user in User.objects.filter(username__in=list(rows)).select_related('userprofile')
+        }
+        new_rows = [row for username, row in rows.items() if username not in existing]
+        if kwargs['dry_run']:
+            self.stdout.write(self.style.SUCCESS(
+                f"Would create {len(new_rows)} coordinators; {len(existing)} users already exist."
+            ))
+            return
+
+        with transaction.atomic():
+            # bulk_create sends no post_save, so the profiles are created here.
+            users = User.objects.bulk_create([self.build_user(row) for row in new_rows])
+            if not all(user.pk for user in users):
+                # Databases that cannot return the new ids.
+                users = User.objects.filter(username__in=[row['username'] for row in new_rows])
+            profiles = [UserProfile(user_id=user.pk, region=rows[user.username]['region']) for user in users]
+
+            changed = []
+            for username, user in existing.items():
+                try:
+                    profile = user.userprofile
+                except UserProfile.DoesNotExist:
+                    profiles.append(UserProfile(user=user, region=rows[username]['region']))
+                    continue
+                if profile.region != rows[username]['region']:
+                    profile.region = rows[username]['region']
+                    changed.append(profile)
+
+            UserProfile.objects.bulk_create(profiles)
+            UserProfile.objects.bulk_update(changed, ['region'])
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {len(new_rows)} coordinators; updated the region of {len(changed)} existing users."
+        ))
+
+    def read_rows(self, path):
+        """
+        Returns the file's rows as ``{username: row}``, or raises
+        ``CommandError`` listing every invalid line so nothing is half-imported.
+        """
+        try:
+            with open(path, newline='', encoding='utf-8-sig') as file:
+                reader = csv.DictReader(file)
+                missing = [column for column in REQUIRED_COLUMNS if column not in (reader.fieldnames or [])]
+                if missing:
+                    raise CommandError(f"Missing column(s): {', '.join(missing)}.")
+                rows, errors = {}, []
+                for line, raw in enumerate(reader, start=2):
+                    row = {
+                        column: (raw.get(column) or '').strip()
+                        for column in REQUIRED_COLUMNS + OPTIONAL_COLUMNS
+                    }
+                    if not row['username'] or not row['region']:
+                        errors.append(f"line {line}: username and region are required")
+                    elif row['username'] in rows:
+                        errors.append(f"line {line}: duplicate username {row['username']!r}")
+                    else:
+                        rows[row['username']] = row
+        except OSError as exc:
+            raise CommandError(f"Cannot read {path}: {exc}")
+        if errors:
+            raise CommandError("Invalid rows:\n" + "\n".join(errors))
+        return rows
+
+    def build_user(self, row):
+
+        return User(
+            username=row['username'],
+            email=row['email'],
+            first_name=row['first_name'],
+            last_name=row['last_name'],
+            # Coordinators without a password in the file must have one set
+            # for them before they can log in.
+            password=make_password(row['password'] or None),
+        )
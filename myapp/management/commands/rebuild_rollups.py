@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+from myapp.cache import bump_data_version
+from myapp.rollups import rebuild_rollups
+
+class Command(BaseCommand):
+    help = 'Rebuild the ApplicantDailyRollup table from all Applicant rows.'
+
+    def handle(self, *args, **kwargs):
+        written = rebuild_rollups()
+        bump_data_version()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt daily rollups: {written} rows written."))
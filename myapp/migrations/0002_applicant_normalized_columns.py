@@ -0,0 +1,79 @@
+# Generated by Django 5.0.6 on 2026-10-18 10:25
+
+from django.db import migrations, models
+
+NORMALIZED_FIELDS = {
+    'clean_status': 'application_status',
+    'clean_course': 'nd_title',
+    'clean_gender': 'gender',
+    'clean_region': 'region',
+}
+
+
+def normalize(value):
+    # myapp.models.normalize_category, which migrations must not import.
+    return None if value is None else str(value).strip().lower()
+
+
+def backfill_normalized_columns(apps, schema_editor):
+    # In Python rather than Lower(Trim(...)): SQL TRIM strips spaces only,
+    # where str.strip() also strips tabs and newlines.
+    Applicant = apps.get_model('myapp', 'Applicant')
+    batch = []
+    applicants = Applicant.objects.only('id', *NORMALIZED_FIELDS.values()).order_by('id')
+    for applicant in applicants.iterator(chunk_size=2000):
+        for clean_field, source_field in NORMALIZED_FIELDS.items():
+            setattr(applicant, clean_field, normalize(getattr(applicant, source_field)))
+        batch.append(applicant)
+        if len(batch) >= 2000:
+            Applicant.objects.bulk_update(batch, list(NORMALIZED_FIELDS))
+            batch.clear()
+    if batch:
+        Applicant.objects.bulk_update(batch, list(NORMALIZED_FIELDS))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='applicant',
+            name='clean_course',
+            field=models.CharField(blank=True, editable=False, max_length=512, null=True),
+        ),
+        migrations.AddField(
+            model_name='applicant',
+            name='clean_gender',
+            field=models.CharField(blank=True, editable=False, max_length=50, null=True),
+        ),
+        migrations.AddField(
+            model_name='applicant',
+            name='clean_region',
+            field=models.CharField(blank=True, editable=False, max_length=100, null=True),
+        ),
+        migrations.AddField(
+            model_name='applicant',
+            name='clean_status',
+            field=models.CharField(blank=True, editable=False, max_length=100, null=True),
+        ),
+        migrations.RunPython(backfill_normalized_columns, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='applicant',
+            index=models.Index(fields=['application_submitted_at'], name='applicant_submitted_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='applicant',
+            index=models.Index(fields=['clean_region', 'application_submitted_at'], name='applicant_region_sub_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='applicant',
+            index=models.Index(fields=['clean_region', 'clean_status', 'application_submitted_at'], name='applicant_region_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='applicant',
+            index=models.Index(fields=['clean_status', 'application_submitted_at'], name='applicant_status_sub_idx'),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.0.6 on 2026-10-18 10:26
+
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+
+
+def build_rollups(apps, schema_editor):
+    Applicant = apps.get_model('myapp', 'Applicant')
+    ApplicantDailyRollup = apps.get_model('myapp', 'ApplicantDailyRollup')
+    rows = (
+        Applicant.objects.annotate(day=TruncDate('application_submitted_at'))
+        .values('day', 'clean_region', 'clean_status', 'clean_course', 'clean_gender')
+        .annotate(applicant_count=Count('id'))
+        .order_by()
+    )
+    ApplicantDailyRollup.objects.bulk_create(
+        (ApplicantDailyRollup(**row) for row in rows.iterator()), batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0002_applicant_normalized_columns'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ApplicantDailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(blank=True, null=True)),
+                ('clean_region', models.CharField(blank=True, max_length=100, null=True)),
+                ('clean_status', models.CharField(blank=True, max_length=100, null=True)),
+                ('clean_course', models.CharField(blank=True, max_length=512, null=True)),
+                ('clean_gender', models.CharField(blank=True, max_length=50, null=True)),
+                ('applicant_count', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['clean_region', 'day'], name='rollup_region_day_idx'), models.Index(fields=['day'], name='rollup_day_idx')],
+            },
+        ),
+        migrations.RunPython(build_rollups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,68 @@
+# Generated by Django 5.0.6 on 2026-10-18 10:38
+
+from django.db import migrations, models
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import TruncDate
+
+
+def remove_duplicate_applicants(apps, schema_editor):
+    # Keep the most recently updated row per application_id, then rebuild
+    # the daily rollups, whose counts included the removed copies.
+    Applicant = apps.get_model('myapp', 'Applicant')
+    ApplicantDailyRollup = apps.get_model('myapp', 'ApplicantDailyRollup')
+
+    duplicated = (
+        Applicant.objects.filter(application_id__gt='')
+        .values('application_id')
+        .annotate(copies=Count('id'))
+        .filter(copies__gt=1)
+        .values('application_id')
+    )
+    keeper = (
+        Applicant.objects.filter(application_id=OuterRef('application_id'))
+        .order_by(F('applicant_updated_at').desc(nulls_last=True), '-id')
+        .values('id')[:1]
+    )
+    deleted, _ = (
+        Applicant.objects.filter(application_id__in=duplicated)
+        .exclude(id=Subquery(keeper))
+        .delete()
+    )
+    if not deleted:
+        return
+
+    ApplicantDailyRollup.objects.all().delete()
+    rows = (
+        Applicant.objects.annotate(day=TruncDate('application_submitted_at'))
+        .values('day', 'clean_region', 'clean_status', 'clean_course', 'clean_gender')
+        .annotate(applicant_count=Count('id'))
+        .order_by()
+    )
+    ApplicantDailyRollup.objects.bulk_create(
+        (ApplicantDailyRollup(**row) for row in rows.iterator()), batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0004_uploadjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='uploadjob',
+            name='rows_unchanged',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='uploadjob',
+            name='rows_updated',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(remove_duplicate_applicants, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='applicant',
+            constraint=models.UniqueConstraint(condition=models.Q(('application_id__gt', '')), fields=('application_id',), name='applicant_application_id_uniq'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.0.6 on 2026-10-18 10:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0005_applicant_upsert_key'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='applicant',
+            index=models.Index(fields=['application_submitted_at', 'id'], name='applicant_sub_id_idx'),
+        ),
+        migrations.RemoveIndex(
+            model_name='applicant',
+            name='applicant_submitted_idx',
+        ),
+    ]
@@ -0,0 +1,79 @@
+# Generated by Django 5.0.6 on 2026-10-18 10:45
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+TRIGRAM_COLUMNS = ['first_name', 'last_name', 'email', 'application_id']
+
+
+def create_search_objects(apps, schema_editor):
+    # PostgreSQL only: a trigger keeps search_vector current for every write
+    # path (save, bulk_create, bulk_update, COPY upserts), a GIN index serves
+    # the prefix tsquery, and pg_trgm indexes on UPPER(col::text) serve the
+    # icontains fallback, which compiles to UPPER(col::text) LIKE UPPER(%s).
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(
+        """
+        CREATE OR REPLACE FUNCTION myapp_applicant_search_vector() RETURNS trigger AS $$
+        BEGIN
+            NEW.search_vector :=
+                setweight(to_tsvector('simple', coalesce(NEW.first_name, '') || ' '
+                                                || coalesce(NEW.last_name, '') || ' '
+                                                || coalesce(NEW.application_id, '')), 'A')
+                || setweight(to_tsvector('simple', coalesce(NEW.email, '')), 'B');
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+        """
+    )
+    schema_editor.execute(
+        """
+        CREATE TRIGGER applicant_search_vector_update
+        BEFORE INSERT OR UPDATE OF first_name, last_name, email, application_id, search_vector
+        ON myapp_applicant
+        FOR EACH ROW EXECUTE FUNCTION myapp_applicant_search_vector()
+        """
+    )
+    schema_editor.execute('UPDATE myapp_applicant SET search_vector = NULL')
+    schema_editor.execute(
+        'CREATE INDEX applicant_search_vector_idx ON myapp_applicant USING gin (search_vector)'
+    )
+
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+        has_trigram = cursor.fetchone() is not None
+    if not has_trigram:
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for column in TRIGRAM_COLUMNS:
+        schema_editor.execute(
+            f'CREATE INDEX applicant_{column}_trgm_idx ON myapp_applicant '
+            f'USING gin (UPPER({column}::text) gin_trgm_ops)'
+        )
+
+
+def drop_search_objects(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for column in TRIGRAM_COLUMNS:
+        schema_editor.execute(f'DROP INDEX IF EXISTS applicant_{column}_trgm_idx')
+    schema_editor.execute('DROP INDEX IF EXISTS applicant_search_vector_idx')
+    schema_editor.execute('DROP TRIGGER IF EXISTS applicant_search_vector_update ON myapp_applicant')
+    schema_editor.execute('DROP FUNCTION IF EXISTS myapp_applicant_search_vector()')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0006_applicant_keyset_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='applicant',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(create_search_objects, drop_search_objects),
+    ]
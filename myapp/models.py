@@ -2,6 +2,19 @@
 
 from django.db import models
 from django.contrib.auth.models import User
+from django.contrib.postgres.search import SearchVectorField
+from django.utils import timezone
+
+
+def normalize_category(value):
+    """
+    Returns the trimmed, lower-cased form of a categorical value, as stored
+    in the ``clean_*`` columns and compared against by the dashboard filters.
+    """
+    if value is None:
+        return None
+    return str(value).strip().lower()
+
 
 class UserProfile(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE)
@@ -114,5 +127,173 @@ class Applicant(models.Model):
                                       verbose_name="What is your primary reason for enrolling in this program?"
                                    )
 
+    # Normalized copies of the categorical columns, filled at ingest time so
+    # filters and group-bys can use plain B-tree indexes.
+    clean_status                 = models.CharField(max_length=100, null=True, blank=True, editable=False)
+    clean_course                 = models.CharField(max_length=512, null=True, blank=True, editable=False)
+    clean_gender                 = models.CharField(max_length=50, null=True, blank=True, editable=False)
+    clean_region                 = models.CharField(max_length=100, null=True, blank=True, editable=False)
+
+    NORMALIZED_FIELDS = {
+        "clean_status": "application_status",
+        "clean_course": "nd_title",
+        "clean_gender": "gender",
+        "clean_region": "region",
+    }
+
+    # Full-text document over the searchable columns. On PostgreSQL a
+    # trigger keeps it current on every insert and update (migration 0007),
+    # so writers leave it out; it stays NULL on other backends.
+    search_vector                = SearchVectorField(null=True, blank=True, editable=False)
+
+    SEARCH_FIELDS = ["first_name", "last_name", "email", "application_id"]
+    TRIGGER_FIELDS = ["search_vector"]
+
+    class Meta:
+        indexes = [
+            # Also serves ApplicantCursorPagination's (submitted_at, id) keyset.
+            models.Index(fields=["application_submitted_at", "id"], name="applicant_sub_id_idx"),
+            models.Index(fields=["clean_region", "application_submitted_at"], name="applicant_region_sub_idx"),
+            models.Index(
+                fields=["clean_region", "clean_status", "application_submitted_at"],
+                name="applicant_region_status_idx",
+            ),
+            models.Index(fields=["clean_status", "application_submitted_at"], name="applicant_status_sub_idx"),
+        ]
+        constraints = [
+            # Uploads upsert on application_id; rows without one are plain inserts.
+            models.UniqueConstraint(
+                fields=["application_id"],
+                condition=models.Q(application_id__gt=""),
+                name="applicant_application_id_uniq",
+            ),
+        ]
+
+    def fill_normalized_fields(self):
+        for clean_field, source_field in self.NORMALIZED_FIELDS.items():
+            setattr(self, clean_field, normalize_category(getattr(self, source_field)))
+
+    def save(self, *args, **kwargs):
+        self.fill_normalized_fields()
+        super().save(*args, **kwargs)
+
     def __str__(self):
         return f"{self.application_id} – {self.first_name} {self.last_name}"
+
+
+class ApplicantDailyRollup(models.Model):
+    """
+    Applicant counts per submission day and normalized dimension tuple.
+    Rebuilt from ``Applicant`` by ``myapp.rollups``; the analytics views read
+    from here whenever the request filters map onto these columns.
+    """
+    day                          = models.DateField(null=True, blank=True)
+    clean_region                 = models.CharField(max_length=100, null=True, blank=True)
+    clean_status                 = models.CharField(max_length=100, null=True, blank=True)
+    clean_course                 = models.CharField(max_length=512, null=True, blank=True)
+    clean_gender                 = models.CharField(max_length=50, null=True, blank=True)
+    applicant_count              = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["clean_region", "day"], name="rollup_region_day_idx"),
+            models.Index(fields=["day"], name="rollup_day_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.day} {self.clean_region}: {self.applicant_count}"
+
+
+class UploadJob(models.Model):
+    """
+    One bulk upload, tracked from the moment the file is received until its
+    last chunk is ingested. Row counters are bumped in throttled batches by
+    the ingest tasks.
+    """
+    PENDING = "pending"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    STATUS_CHOICES = [
+        (PENDING, "Pending"),
+        (RUNNING, "Running"),
+        (SUCCEEDED, "Succeeded"),
+        (FAILED, "Failed"),
+    ]
+
+    file_name                    = models.CharField(max_length=255)
+    file_path                    = models.CharField(max_length=1024)
+    uploaded_by                  = models.ForeignKey(User, null=True, blank=True, on_delete=models.SET_NULL)
+    status                       = models.CharField(max_length=20, choices=STATUS_CHOICES, default=PENDING)
+    chunks                       = models.PositiveIntegerField(default=0)
+    rows_total                   = models.PositiveIntegerField(null=True, blank=True)
+    rows_read                    = models.PositiveIntegerField(default=0)
+    rows_inserted                = models.PositiveIntegerField(default=0)
+    rows_updated                 = models.PositiveIntegerField(default=0)
+    rows_unchanged               = models.PositiveIntegerField(default=0)
+    rows_rejected                = models.PositiveIntegerField(default=0)
+    rows_with_warnings           = models.PositiveIntegerField(default=0)
+    error                        = models.TextField(null=True, blank=True)
+    error_report                 = models.CharField(max_length=1024, null=True, blank=True)
+    created_at                   = models.DateTimeField(auto_now_add=True)
+    started_at                   = models.DateTimeField(null=True, blank=True)
+    finished_at                  = models.DateTimeField(null=True, blank=True)
+
+    @property
+    def elapsed_seconds(self):
+        if self.started_at is None:
+            return None
+        return ((self.finished_at or timezone.now()) - self.started_at).total_seconds()
+
+    @property
+    def rows_per_second(self):
+        elapsed = self.elapsed_seconds
+        if not elapsed:
+            return None
+        return round(self.rows_read / elapsed, 1)
+
+    @property
+    def eta_seconds(self):
+        if self.status != self.RUNNING or not self.rows_total:
+            return None
+        rate = self.rows_per_second
+        if not rate:
+            return None
+        return max(round((self.rows_total - self.rows_read) / rate), 0)
+
+    def __str__(self):
+        return f"{self.file_name} ({self.status})"
+
+
+class ExportJob(models.Model):
+    """
+    One background export of a filtered applicant list, written under
+    ``MEDIA_ROOT`` by the ``export_applicants`` task. ``params`` holds the
+    normalized filter params the list was requested with.
+    """
+    PENDING = UploadJob.PENDING
+    RUNNING = UploadJob.RUNNING
+    SUCCEEDED = UploadJob.SUCCEEDED
+    FAILED = UploadJob.FAILED
+    STATUS_CHOICES = UploadJob.STATUS_CHOICES
+
+    CSV = "csv"
+    XLSX = "xlsx"
+    FORMAT_CHOICES = [
+        (CSV, "CSV"),
+        (XLSX, "Excel workbook"),
+    ]
+
+    requested_by                 = models.ForeignKey(User, null=True, blank=True, on_delete=models.SET_NULL)
+    file_format                  = models.CharField(max_length=10, choices=FORMAT_CHOICES, default=CSV)
+    params                       = models.JSONField(default=dict, blank=True)
+    status                       = models.CharField(max_length=20, choices=STATUS_CHOICES, default=PENDING)
+    file                         = models.CharField(max_length=1024, null=True, blank=True)
+    rows_written                 = models.PositiveIntegerField(default=0)
+    error                        = models.TextField(null=True, blank=True)
+    created_at                   = models.DateTimeField(auto_now_add=True)
+    started_at                   = models.DateTimeField(null=True, blank=True)
+    finished_at                  = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"export {self.pk} ({self.file_format}, {self.status})"
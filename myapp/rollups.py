@@ -0,0 +1,125 @@
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+
+from django.db import connection, transaction
+from django.db.models import Count, Q
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .models import Applicant, ApplicantDailyRollup
+
+ROLLUP_DIMENSIONS = ("clean_region", "clean_status", "clean_course", "clean_gender")
+# Advisory lock key held by every transaction that rewrites rollup rows.
+ROLLUP_LOCK_KEY = 0x726F6C6C  # "roll"
+
+
+def start_of_day(day):
+
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def rollup_day(value):
+    """
+    Returns the calendar day a submission timestamp is counted under,
+    matching ``TruncDate`` in the current time zone.
+    """
+    if value is None:
+        return None
+    if timezone.is_aware(value):
+        value = timezone.localtime(value)
+    return value.date()
+
+
+def rollup_key(row):
+    """
+    Returns the ``(day, region)`` pair an ingested row dict is rolled up under.
+    """
+    return (rollup_day(row["application_submitted_at"]), row["clean_region"])
+
+
+def _aggregate(applicants, day_filter=None):
+
+    applicants = applicants.annotate(day=TruncDate("application_submitted_at"))
+    if day_filter is not None:
+        applicants = applicants.filter(day_filter)
+    return (
+        applicants.values("day", *ROLLUP_DIMENSIONS)
+        .annotate(applicant_count=Count("id"))
+        .order_by()
+    )
+
+
+def _lock_rollups():
+    """
+    Serializes rollup rewrites until the current transaction ends. Without
+    it two uploads finalizing at once (or a finalize and ``fail_upload``'s
+    rebuild) could both delete the same rows and both insert them again,
+    doubling the counts. Each statement after the lock sees the rows the
+    previous holder committed. SQLite already serializes writers.
+    """
+    if connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_advisory_xact_lock(%s)", [ROLLUP_LOCK_KEY])
+
+
+def _write(rows, batch_size=1000):
+
+    batch = []
+    written = 0
+    for row in rows:
+        batch.append(ApplicantDailyRollup(**row))
+        if len(batch) >= batch_size:
+            ApplicantDailyRollup.objects.bulk_create(batch)
+            written += len(batch)
+            batch.clear()
+
+    if batch:
+        ApplicantDailyRollup.objects.bulk_create(batch)
+        written += len(batch)
+    return written
+
+
+def rebuild_rollups():
+    """
+    Drops and recomputes the whole rollup table.
+    """
+    with transaction.atomic():
+        _lock_rollups()
+        ApplicantDailyRollup.objects.all().delete()
+        return _write(_aggregate(Applicant.objects.all()).iterator())
+
+
+def refresh_rollups(keys):
+    """
+    Recomputes only the rollup rows for the given ``(day, region)`` pairs,
+    as collected by the ingest task for the rows it inserted.
+    """
+    days_by_region = defaultdict(set)
+    for day, region in keys:
+        days_by_region[region].add(day)
+
+    written = 0
+    with transaction.atomic():
+        _lock_rollups()
+        for region, days in days_by_region.items():
+            rollups = ApplicantDailyRollup.objects.filter(clean_region=region)
+            applicants = Applicant.objects.filter(clean_region=region)
+
+            known_days = sorted(day for day in days if day is not None)
+            day_filter = Q(day__in=known_days)
+            if None in days:
+                day_filter |= Q(day__isnull=True)
+            if known_days:
+                applicants = applicants.filter(
+                    Q(
+                        application_submitted_at__gte=start_of_day(known_days[0]),
+                        application_submitted_at__lt=start_of_day(
+                            known_days[-1] + timedelta(days=1)
+                        ),
+                    )
+                    | Q(application_submitted_at__isnull=True)
+                )
+
+            rollups.filter(day_filter).delete()
+            written += _write(_aggregate(applicants, day_filter))
+    return written
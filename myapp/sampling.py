@@ -0,0 +1,120 @@
+import math
+from collections import Counter
+
+from django.conf import settings
+from django.core.exceptions import EmptyResultSet
+from django.db import connection
+
+# Half-width of a 95% normal confidence interval, in standard errors.
+Z_95 = 1.96
+# Fixed so that every request samples the same blocks while the table is
+# unchanged: moving a filter then does not also move the sample.
+SAMPLE_SEED = 0
+
+
+def sampling_supported():
+
+    return connection.vendor == "postgresql"
+
+
+def estimate_table_rows(model):
+    """
+    Returns the planner's row count for ``model``'s table (``reltuples``,
+    kept up to date by autovacuum's ANALYZE), or ``None`` if the table has
+    never been analyzed.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT reltuples FROM pg_class WHERE oid = %s::regclass",
+            [connection.ops.quote_name(model._meta.db_table)],
+        )
+        row = cursor.fetchone()
+    if row is None or row[0] < 0:
+        return None
+    return int(row[0])
+
+
+def sample_percent(table_rows):
+    """
+    Returns the ``TABLESAMPLE`` percentage that reads about
+    ``ANALYTICS_APPROX_SAMPLE_ROWS`` rows of a ``table_rows`` table; 100 for
+    tables small (or unknown) enough to aggregate exactly.
+    """
+    if not table_rows:
+        return 100.0
+    return min(100.0, 100.0 * settings.ANALYTICS_APPROX_SAMPLE_ROWS / table_rows)
+
+
+def tablesample_clause(percent):
+
+    return f"TABLESAMPLE SYSTEM ({float(percent)!r}) REPEATABLE ({SAMPLE_SEED})"
+
+
+def sampled_rows(queryset, percent):
+    """
+    Evaluates ``queryset`` (a ``.values()`` aggregate over a single model)
+    against a ``TABLESAMPLE SYSTEM`` of ``percent`` of its table's pages.
+    The ORM cannot express ``TABLESAMPLE``, so it is spliced into the
+    compiled SQL after the table name. A queryset that cannot match
+    anything (``.none()``) returns no rows.
+    """
+    try:
+        sql, params = queryset.query.sql_with_params()
+    except EmptyResultSet:
+        return []
+    table = connection.ops.quote_name(queryset.model._meta.db_table)
+    source = f"FROM {table}"
+    if sql.count(source) != 1:
+        raise ValueError(f"Cannot sample {table}: expected one {source!r} in {sql!r}.")
+    sql = sql.replace(source, f"{source} {tablesample_clause(percent)}")
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        columns = [column.name for column in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+
+def count_sampled_rows(model, percent):
+    """
+    Returns how many rows the pages ``sampled_rows`` reads for ``percent``
+    hold, filters aside: the same seed picks the same pages.
+    """
+    table = connection.ops.quote_name(model._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT COUNT(*) FROM {table} {tablesample_clause(percent)}")
+        return cursor.fetchone()[0]
+
+
+def scale_summary(summary, sample_rows, table_rows, percent):
+    """
+    Scales a summary folded from a sample of ``sample_rows`` rows (filters
+    aside) up to a ``table_rows`` table, in place, and adds 95% ``margins``
+    for every figure.
+
+    Each count is its share of the sample times the table's row count, a
+    ratio estimate: pages hold varying numbers of rows, so dividing by the
+    sampling fraction instead would carry the sample's size error into
+    every figure. With no filters the total is then exactly ``table_rows``.
+
+    The margins assume rows are sampled independently. ``SYSTEM`` samples
+    whole pages, and rows loaded together (one upload) share pages, so the
+    real error can be larger when a filter matches rows that cluster.
+    """
+    finite = 1 - percent / 100
+    margins = {}
+
+    def estimate(count):
+        if not sample_rows:
+            return 0, 0
+        share = count / sample_rows
+        margin = Z_95 * table_rows * math.sqrt(share * (1 - share) * finite / sample_rows)
+        return round(table_rows * share), math.ceil(margin)
+
+    summary["total"], margins["total"] = estimate(summary["total"])
+    for key in ("gender", "status", "course"):
+        counts, margins[key] = Counter(), Counter()
+        for name, count in summary[key].items():
+            counts[name], margins[key][name] = estimate(count)
+        summary[key] = counts
+
+    summary["margins"] = margins
+    return summary
@@ -0,0 +1,50 @@
+from .models import Applicant, UserProfile, normalize_category
+
+
+def get_profile_region(user):
+    """
+    Returns the normalized region of ``user``'s profile, or ``False`` if
+    they have none. Costs a query unless the profile is already loaded.
+    """
+    try:
+        return normalize_category(user.userprofile.region)
+    except UserProfile.DoesNotExist:
+        return False
+
+
+def get_region_scope(user):
+    """
+    Returns the normalized region ``user`` is restricted to, ``None`` for
+    staff users who see every region, or ``False`` for a non-staff user
+    without a profile, who sees nothing.
+
+    Users authenticated by ``RegionJWTAuthentication`` carry the region from
+    their token's claim, so scoping them costs no query; anyone else falls
+    back to the profile.
+    """
+
+    if user.is_staff:
+        return None
+    region = getattr(user, "region_claim", None)
+    if region is None:
+        region = get_profile_region(user)
+    return region
+
+
+def scope_queryset(queryset, user):
+    """
+    Restricts ``queryset`` (applicants or rollups) to the rows visible to
+    ``user``: everything for staff, otherwise only the profile's region.
+    """
+
+    region = get_region_scope(user)
+    if region is None:
+        return queryset
+    if region is False:
+        return queryset.none()
+    return queryset.filter(clean_region=region)
+
+
+def get_scoped_applicants(user):
+
+    return scope_queryset(Applicant.objects.all(), user)
@@ -0,0 +1,60 @@
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db import connection
+from django.db.models import F, Q
+
+from .models import Applicant
+
+
+def prefix_tsquery(text):
+    """
+    Returns a raw ``tsquery`` that matches every word of ``text`` as a
+    prefix (``'jo':* & 'sm':*``), or ``None`` if ``text`` has no words.
+    """
+    terms = text.split()
+    if not terms:
+        return None
+    return " & ".join(
+        "'{}':*".format(term.replace("\\", "\\\\").replace("'", "''")) for term in terms
+    )
+
+
+def search_query(text):
+
+    query = prefix_tsquery(text)
+    if query is None:
+        return None
+    return SearchQuery(query, search_type="raw", config="simple")
+
+
+def search_filter(text):
+    """
+    Returns the filter for the student search box: a substring match on any
+    of ``Applicant.SEARCH_FIELDS`` (the original behavior, backed by pg_trgm
+    indexes on PostgreSQL), or, on PostgreSQL, every word matching a prefix
+    of some field, via the ``search_vector`` GIN index.
+    """
+    condition = Q()
+    for field_name in Applicant.SEARCH_FIELDS:
+        condition |= Q(**{f"{field_name}__icontains": text})
+
+    query = search_query(text) if connection.vendor == "postgresql" else None
+    if query is not None:
+        condition |= Q(search_vector=query)
+    return condition
+
+
+def rank_search(queryset, text):
+    """
+    Filters ``queryset`` with ``search_filter`` and orders it best match
+    first on PostgreSQL: ``ts_rank`` of the prefix query plus that of the
+    whole words, so ``name12`` ranks ``Name12`` above ``Name123``, with names
+    and application ids weighing more than email. Other backends order
+    newest first.
+    """
+    queryset = queryset.filter(search_filter(text))
+    query = search_query(text) if connection.vendor == "postgresql" else None
+    if query is None:
+        return queryset.order_by("-application_submitted_at", "-id")
+    words = SearchQuery(text, search_type="plain", config="simple")
+    rank = SearchRank(F("search_vector"), query) + SearchRank(F("search_vector"), words)
+    return queryset.annotate(rank=rank).order_by("-rank", "-application_submitted_at", "-id")
@@ -1,6 +1,7 @@
+from django.urls import reverse
 from rest_framework import serializers
 from django.contrib.auth.models import User
-from .models import Applicant, UserProfile
+from .models import Applicant, ExportJob, UploadJob, UserProfile
 
 
 class UserProfileSerializer(serializers.ModelSerializer):
@@ -41,4 +42,79 @@ class ApplicantSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Applicant
-        fields = "__all__"
+        exclude = [*Applicant.NORMALIZED_FIELDS, *Applicant.TRIGGER_FIELDS]
+
+
+# The fields ApplicantSerializer renders, in model order; the ?fields=
+# projection and the exports select from these.
+APPLICANT_FIELDS = [
+    field.name
+    for field in Applicant._meta.concrete_fields
+    if field.name not in ApplicantSerializer.Meta.exclude
+]
+
+
+class UploadJobSerializer(serializers.ModelSerializer):
+
+    rows_per_second = serializers.FloatField(read_only=True)
+    eta_seconds = serializers.IntegerField(read_only=True)
+    error_report_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = UploadJob
+        fields = [
+            "id",
+            "file_name",
+            "status",
+            "chunks",
+            "rows_total",
+            "rows_read",
+            "rows_inserted",
+            "rows_updated",
+            "rows_unchanged",
+            "rows_rejected",
+            "rows_with_warnings",
+            "rows_per_second",
+            "eta_seconds",
+            "error",
+            "error_report_url",
+            "created_at",
+            "started_at",
+            "finished_at",
+        ]
+
+    def get_error_report_url(self, job):
+
+        if not job.error_report:
+            return None
+        request = self.context.get("request")
+        url = reverse("upload-errors", kwargs={"pk": job.pk})
+        return request.build_absolute_uri(url) if request else url
+
+
+class ExportJobSerializer(serializers.ModelSerializer):
+
+    download_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ExportJob
+        fields = [
+            "id",
+            "file_format",
+            "params",
+            "status",
+            "rows_written",
+            "error",
+            "download_url",
+            "created_at",
+            "started_at",
+            "finished_at",
+        ]
+
+    def get_download_url(self, job):
+
+        if job.status != ExportJob.SUCCEEDED:
+            return None
+        request = self.context.get("request")
+        url = reverse("applicant-export-download", kwargs={"pk": job.pk})
+        return request.build_absolute_uri(url) if request else url
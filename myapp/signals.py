@@ -5,9 +5,13 @@ from .models import UserProfile
 
 
 @receiver(post_save, sender=User)
-def create_or_update_user_profile(sender, instance, created, **kwargs):
+def create_user_profile(sender, instance, created, raw=False, **kwargs):
+    """
+    Gives each new user an empty profile. Later saves (``last_login``
+    updates, admin edits) leave it alone, since the admin inline saves the
+    profile itself; fixture loads (``raw``) bring their own profiles, and
+    ``import_coordinators`` creates them in bulk.
+    """
 
-    if not hasattr(instance, "userprofile"):
+    if created and not raw:
         UserProfile.objects.create(user=instance)
-    else:
-        instance.userprofile.save()
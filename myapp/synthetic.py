@@ -0,0 +1,252 @@
+import csv
+import random
+from bisect import bisect
+from datetime import datetime, timedelta
+from itertools import accumulate
+
+from openpyxl import Workbook
+
+from .models import Applicant
+
+REGIONS = [
+    ("Addis Ababa", 30),
+    ("Oromia", 20),
+    ("Amhara", 15),
+    ("Sidama", 6),
+    ("Tigray", 5),
+    ("Central Ethiopia", 5),
+    ("South Ethiopia", 4),
+    ("Dire Dawa", 4),
+    ("Somali", 3),
+    ("South West Ethiopia", 2),
+    ("Harari", 2),
+    ("Afar", 1),
+    ("Benishangul-Gumuz", 1),
+    ("Gambela", 1),
+    ("", 1),
+]
+STATUSES = [
+    ("Submitted", 35),
+    ("Enrolled", 25),
+    ("Closed", 15),
+    ("Rejected", 10),
+    ("In Progress", 10),
+    ("Withdrawn", 5),
+]
+# (nd_title, nd_key, program_key)
+COURSES = [
+    (("Programming Fundamentals", "nd003", "PF"), 30),
+    (("Data Analysis Fundamentals", "nd002", "DAF"), 25),
+    (("Android Developer Fundamentals", "nd803", "ADF"), 20),
+    (("AI Fundamentals", "nd004", "AIF"), 15),
+    (("Front End Web Developer", "nd0011", "FEND"), 10),
+]
+GENDERS = [("Male", 55), ("Female", 43), ("", 2)]
+EDUCATION_LEVELS = [
+    ("Bachelor's degree", 55),
+    ("Diploma", 15),
+    ("Master's degree", 12),
+    ("High school", 10),
+    ("Technical and vocational training", 7),
+    ("PhD", 1),
+]
+EMPLOYMENT_STATUSES = [
+    ("Unemployed", 40),
+    ("Employed full-time", 30),
+    ("Student", 15),
+    ("Employed part-time", 8),
+    ("Self-employed", 7),
+]
+FIELDS_OF_STUDY = [
+    ("Computer Science", 30),
+    ("Information Systems", 15),
+    ("Engineering", 15),
+    ("Business", 12),
+    ("Economics", 8),
+    ("Mathematics", 5),
+    ("Health Sciences", 5),
+    ("Other", 10),
+]
+HEARD_ABOUT = [
+    ("Social media", 45),
+    ("Friend or colleague", 25),
+    ("University", 15),
+    ("Employer", 5),
+    ("News", 5),
+    ("Other", 5),
+]
+EXPERIENCE = [("0", 35), ("1-2", 30), ("3-5", 20), ("6-10", 10), ("10+", 5)]
+INSTITUTIONS = [
+    "Addis Ababa University",
+    "Bahir Dar University",
+    "Jimma University",
+    "Hawassa University",
+    "Mekelle University",
+    "University of Gondar",
+    "Haramaya University",
+    "Adama Science and Technology University",
+]
+FIRST_NAMES = [
+    "Abebe", "Almaz", "Bekele", "Bethlehem", "Dawit", "Eden", "Fikre", "Genet",
+    "Hana", "Kebede", "Lidya", "Meron", "Mulugeta", "Selam", "Tesfaye", "Yonas",
+]
+LAST_NAMES = [
+    "Alemu", "Asfaw", "Bekele", "Demissie", "Gebre", "Girma", "Haile", "Kassa",
+    "Mekonnen", "Negash", "Tadesse", "Tesfaye", "Wolde", "Worku", "Yohannes", "Zewdu",
+]
+COMPANIES = ["Ethio Telecom", "Safaricom Ethiopia", "Commercial Bank of Ethiopia", "Dashen Bank", "iCog Labs"]
+REASONS = [
+    "I want to grow my career in tech.",
+    "To get a job as a developer.",
+    "To improve my data skills for my current job.",
+    "To start my own business.",
+]
+
+# How often a categorical value is stored as-is, lower-cased, upper-cased
+# or padded with whitespace (cumulative).
+MESSY_CUM_WEIGHTS = [70, 80, 88, 100]
+
+
+class WeightedChoice:
+
+    def __init__(self, weighted):
+        self.values = [value for value, _ in weighted]
+        self.cum_weights = list(accumulate(weight for _, weight in weighted))
+        self.total = self.cum_weights[-1]
+
+    def __call__(self, rnd):
+        return self.values[bisect(self.cum_weights, rnd.random() * self.total)]
+
+
+def messy(rnd, value):
+
+    if not value:
+        return value
+    roll = rnd.random() * MESSY_CUM_WEIGHTS[-1]
+    if roll < MESSY_CUM_WEIGHTS[0]:
+        return value
+    if roll < MESSY_CUM_WEIGHTS[1]:
+        return value.lower()
+    if roll < MESSY_CUM_WEIGHTS[2]:
+        return value.upper()
+    return f" {value}  "
+
+
+def upload_fields():
+    """
+    Returns the ``Applicant`` fields an export has a column for.
+    """
+    return [
+        f
+        for f in Applicant._meta.concrete_fields
+        if not f.auto_created
+        and f.name not in Applicant.NORMALIZED_FIELDS
+        and f.name not in Applicant.TRIGGER_FIELDS
+    ]
+
+
+def upload_headers():
+    """
+    Returns the export's header row: the questionnaire wording for the
+    fields that have one, the field name otherwise.
+    """
+    return [
+        str(f.verbose_name) if f.verbose_name != f.name.replace("_", " ") else f.name
+        for f in upload_fields()
+    ]
+
+
+class ApplicantGenerator:
+    """
+    Yields synthetic raw export rows (lists of strings in ``upload_headers()``
+    order) for seeding and benchmarks: weighted regions, statuses, courses
+    and genders, with the messy casing, padding and blanks the ingest
+    normalizes. The same ``seed`` always produces the same rows;
+    ``application_id`` is ``prefix`` plus the row number, so runs with
+    different ``start`` values do not collide.
+    """
+
+    def __init__(self, seed=0, prefix="SYN-", end=None, days=730):
+        self.rnd = random.Random(seed)
+        self.prefix = prefix
+        self.end = end or datetime(2025, 1, 1)
+        self.minutes = days * 24 * 60
+        self.region = WeightedChoice(REGIONS)
+        self.status = WeightedChoice(STATUSES)
+        self.course = WeightedChoice(COURSES)
+        self.gender = WeightedChoice(GENDERS)
+        self.education_level = WeightedChoice(EDUCATION_LEVELS)
+        self.employment_status = WeightedChoice(EMPLOYMENT_STATUSES)
+        self.field_of_study = WeightedChoice(FIELDS_OF_STUDY)
+        self.heard_about = WeightedChoice(HEARD_ABOUT)
+        self.experience = WeightedChoice(EXPERIENCE)
+        self.columns = [f.name for f in upload_fields()]
+
+    def row_values(self, number):
+        rnd = self.rnd
+        title, nd_key, program_key = self.course(rnd)
+        first_name = rnd.choice(FIRST_NAMES)
+        last_name = rnd.choice(LAST_NAMES)
+        submitted = self.end - timedelta(minutes=rnd.randrange(self.minutes))
+        created = submitted - timedelta(minutes=rnd.randrange(60 * 24 * 14))
+        updated = submitted + timedelta(minutes=rnd.randrange(60 * 24 * 30))
+        employment = self.employment_status(rnd)
+        employed = employment.startswith("Employed")
+        return {
+            "application_id": f"{self.prefix}{number:09d}",
+            "program_key": program_key,
+            "nd_title": messy(rnd, title),
+            "user_id": str(rnd.randrange(10**9, 10**10)),
+            "first_name": messy(rnd, first_name),
+            "last_name": last_name,
+            "email": f"{first_name}.{last_name}{number}@example.com".lower(),
+            "nd_key": nd_key,
+            "company_id": "",
+            "company_name": "",
+            "country_at_registration": "Ethiopia",
+            "application_status": messy(rnd, self.status(rnd)),
+            # About 1% of applications were never submitted.
+            "application_submitted_at": "" if rnd.random() < 0.01 else f"{submitted:%Y-%m-%d %H:%M:%S}",
+            "application_created_at": f"{created:%Y-%m-%d %H:%M:%S}",
+            "applicant_updated_at": f"{updated:%Y-%m-%d %H:%M:%S}",
+            "heard_about_program": self.heard_about(rnd),
+            "experience_years": self.experience(rnd),
+            "terms_agreement": "Yes",
+            "employer_name": rnd.choice(COMPANIES) if employed else "",
+            "age": str(rnd.randint(18, 45)),
+            "phone_number": f"+2519{rnd.randrange(10**7, 10**8)}",
+            "nationality": "Ethiopian",
+            "region": messy(rnd, self.region(rnd)),
+            "education_level": self.education_level(rnd),
+            "education_institution": rnd.choice(INSTITUTIONS),
+            "employment_status": employment,
+            "field_of_study": self.field_of_study(rnd),
+            "gender": messy(rnd, self.gender(rnd)),
+            "primary_reason": rnd.choice(REASONS),
+        }
+
+    def rows(self, count, start=0):
+        columns = self.columns
+        for number in range(start, start + count):
+            values = self.row_values(number)
+            yield [values.get(column, "") for column in columns]
+
+
+def write_upload(path, count, seed=0, prefix="SYN-", start=0):
+    """
+    Writes ``count`` synthetic rows to ``path`` as a CSV file or, for an
+    ``.xlsx`` path, a workbook, with the export's header row.
+    """
+    rows = ApplicantGenerator(seed, prefix).rows(count, start)
+    if str(path).lower().endswith(".xlsx"):
+        workbook = Workbook(write_only=True)
+        sheet = workbook.create_sheet()
+        sheet.append(upload_headers())
+        for row in rows:
+            sheet.append(row)
+        workbook.save(path)
+        return
+    with open(path, "w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        writer.writerow(upload_headers())
+        writer.writerows(rows)
@@ -1,129 +1,264 @@
 import os
-import csv
-from celery import shared_task
-from openpyxl import load_workbook
-from .models import Applicant
-from django.db import models
-from django.db.models import CharField, DateTimeField
-from dateutil.parser import parse
+import logging
+from datetime import date
+from itertools import islice
+from celery import chord, shared_task
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.utils import timezone
+from .cache import bump_data_version
+from .exports import write_csv, write_xlsx
+from .ingest import (
+    IngestPlan,
+    read_csv_header,
+    read_csv_rows,
+    read_excel_header,
+    split_csv,
+    split_excel,
+)
+from .jobs import UploadProgress, merge_error_report
+from .models import Applicant, ExportJob, UploadJob
+from .rollups import rebuild_rollups, refresh_rollups
+from .writers import get_applicant_writer
+from .xlsx import XlsxReader
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def process_uploaded_file(job_id):
+    """
+    Splits an upload into chunks and ingests them in parallel as a chord of
+    ``process_upload_chunk`` tasks, followed by ``finalize_upload``. Files
+    that fit in a single chunk are ingested inline by this task.
+    """
+    job = UploadJob.objects.get(pk=job_id)
+    file_path = job.file_path
+    _, ext = os.path.splitext(file_path.lower())
+
+    try:
+        if ext == ".csv":
+            chunks, rows_total = split_csv(file_path, settings.INGEST_CHUNK_BYTES)
+        elif ext == ".xlsx":
+            chunks, rows_total = split_excel(file_path, settings.INGEST_CHUNK_ROWS)
+        else:
+            raise ValueError(f"Unsupported upload file type: {ext or 'none'}")
+
+        UploadJob.objects.filter(pk=job_id).update(
+            status=UploadJob.RUNNING,
+            started_at=timezone.now(),
+            chunks=len(chunks),
+            rows_total=rows_total,
+        )
+
+        if len(chunks) <= 1:
+            results = [process_upload_chunk(job_id, *chunk) for chunk in chunks]
+            return finalize_upload(results, job_id)
+    except Exception as exc:
+        fail_upload(job_id, str(exc))
+        raise
+
+    chord(
+        process_upload_chunk.s(job_id, *chunk) for chunk in chunks
+    )(finalize_upload.s(job_id).on_error(upload_chunk_failed.s(job_id)))
+    return {"chunks": len(chunks)}
 
 
 @shared_task
-def process_uploaded_file(file_path):
+def process_upload_chunk(job_id, start, end, first_row):
+    """
+    Parses and inserts one chunk of an upload: a byte range of a CSV file
+    or a row range of an XLSX sheet.
+    """
+    file_path = UploadJob.objects.values_list("file_path", flat=True).get(pk=job_id)
     _, ext = os.path.splitext(file_path.lower())
 
+    writer = get_applicant_writer()
+    progress = UploadProgress(job_id, writer, first_row)
     if ext == ".csv":
-        process_csv(file_path)
-    elif ext in [".xlsx", ".xls"]:
-        process_excel(file_path)
-
-    os.remove(file_path)
-
-
-def process_csv(file_path):
-    with open(file_path, newline="", encoding="utf-8") as f:
-        reader = csv.reader(f)
-        headers = next(reader)
-        headers = [
-            h.strip().lower().replace(" ", "_").replace("?", "") for h in headers
-        ]
-
-        batch = []
-        batch_size = 1000
-
-        for row in reader:
-            row_data = {
-                headers[i]: val for i, val in enumerate(row) if i < len(headers)
-            }
-            obj = build_applicant_from_dict(row_data)
-            batch.append(obj)
-            if len(batch) >= batch_size:
-                Applicant.objects.bulk_create(batch)
-                batch.clear()
-
-        if batch:
-            Applicant.objects.bulk_create(batch)
-
-
-def process_excel(file_path):
-    wb = load_workbook(filename=file_path, read_only=True)
-    ws = wb.active
-
-    headers = []
-    batch = []
-    batch_size = 1000
-
-    for i, row in enumerate(ws.iter_rows(values_only=True), start=1):
-        if i == 1:
-            headers = [
-                str(cell).strip().lower().replace(" ", "_").replace("?", "")
-                for cell in row
-            ]
-            continue
+        process_csv(file_path, writer, progress, start, end)
+    else:
+        process_excel(file_path, writer, progress, start, end)
+    stats = writer.close()
+
+    stats["report"] = progress.close()
+    stats["touched"] = [
+        [day.isoformat() if day else None, region] for day, region in writer.touched
+    ]
+    return stats
+
+
+@shared_task
+def finalize_upload(results, job_id):
+    """
+    Runs once every chunk of an upload is in: refreshes the rollups the
+    chunks touched, invalidates cached analytics, deletes the temp file and
+    records the totals.
+    """
+    job = UploadJob.objects.get(pk=job_id)
+    touched = {
+        (date.fromisoformat(day) if day else None, region)
+        for result in results
+        for day, region in result["touched"]
+    }
+    refresh_rollups(touched)
+    bump_data_version()
+    remove_upload_file(job.file_path)
+
+    rows = sum(result["rows"] for result in results)
+    seconds = sum(result["seconds"] for result in results)
+    totals = {
+        "chunks": len(results),
+        "rows": rows,
+        **{
+            outcome: sum(result[outcome] for result in results)
+            for outcome in ("inserted", "updated", "unchanged")
+        },
+        "seconds": round(seconds, 3),
+        "rows_per_second": round(rows / seconds) if seconds else None,
+    }
+    UploadJob.objects.filter(pk=job_id).update(
+        status=UploadJob.SUCCEEDED,
+        finished_at=timezone.now(),
+        error_report=merge_error_report(job_id, [result["report"] for result in results]),
+    )
+    logger.info(
+        "Ingested %s rows from %s in %s chunks (%s inserted, %s updated, "
+        "%s unchanged; %s rows/sec per worker)",
+        rows,
+        job.file_name,
+        len(results),
+        totals["inserted"],
+        totals["updated"],
+        totals["unchanged"],
+        totals["rows_per_second"],
+    )
+    return totals
+
 
-        row_data = {headers[j]: cell for j, cell in enumerate(row) if j < len(headers)}
-        obj = build_applicant_from_dict(row_data)
-        batch.append(obj)
-        if len(batch) >= batch_size:
-            Applicant.objects.bulk_create(batch)
-            batch.clear()
+@shared_task
+def upload_chunk_failed(request, exc, traceback, job_id):
+    fail_upload(job_id, str(exc))
+
+
+def fail_upload(job_id, error):
+    """
+    Marks an upload as failed and cleans up after it. Chunks that finished
+    may already have inserted rows, so the rollups are rebuilt in full.
+    """
+    file_path = UploadJob.objects.values_list("file_path", flat=True).get(pk=job_id)
+    UploadJob.objects.filter(pk=job_id).update(
+        status=UploadJob.FAILED, finished_at=timezone.now(), error=error
+    )
+    remove_upload_file(file_path)
+    rebuild_rollups()
+    bump_data_version()
+    logger.error("Upload %s failed: %s", job_id, error)
+
+
+def remove_upload_file(file_path):
 
-    if batch:
-        Applicant.objects.bulk_create(batch)
+    try:
+        os.remove(file_path)
+    except FileNotFoundError:
+        pass
 
-    wb.close()
 
+def ingest_rows(plan, rows, first_row, writer, progress):
+    if settings.INGEST_BLOCK_ROWS:
+        return ingest_blocks(plan, rows, first_row, writer, progress, settings.INGEST_BLOCK_ROWS)
 
-def build_applicant_from_dict(raw_data):
-    field_map = {}
-    for f in Applicant._meta.get_fields():
-        if not (f.concrete and not f.auto_created):
+    for row_number, row in enumerate(rows, start=first_row):
+        progress.row_read()
+        reason = plan.validate_row(row)
+        if reason:
+            progress.reject(row_number, row, reason)
             continue
-        verbose = getattr(f, "verbose_name", f.name)
-        norm = verbose.strip().lower().replace(" ", "_").replace("?", "")
-        if norm in raw_data and f.name not in raw_data:
-            field_map[norm] = f.name
-
-    for k, v in field_map.items():
-        raw_data[v] = raw_data.pop(k)
-
-    datetime_fields = [
-        f.name
-        for f in Applicant._meta.get_fields()
-        if isinstance(f, models.DateTimeField)
-    ]
 
-    for fld in datetime_fields:
-        val = raw_data.get(fld)
-        if isinstance(val, str):
-            val = val.strip()
-            if not val:
-                raw_data[fld] = None
+        writer.write(plan.build_row(row))
+        if plan.issues:
+            progress.warn(row_number, plan.issues)
+            plan.issues = []
+
+
+def ingest_blocks(plan, rows, first_row, writer, progress, block_rows):
+    """
+    Columnar ``ingest_rows``: reads ``block_rows`` rows at a time, converts
+    each block column by column with ``IngestPlan.build_block`` and hands
+    the columns to the writer as they are.
+    """
+    rows = iter(rows)
+    row_number = first_row
+    while block := list(islice(rows, block_rows)):
+        accepted = []
+        accepted_numbers = []
+        for number, row in enumerate(block, start=row_number):
+            reason = plan.validate_row(row)
+            if reason:
+                progress.reject(number, row, reason)
             else:
-                try:
-
-                    raw_data[fld] = parse(val)
-                except (ValueError, TypeError):
-
-                    raw_data[fld] = None
-        elif isinstance(val, (int, float)):
-            raw_data[fld] = None
-    model_fields = [
-        f.name
-        for f in Applicant._meta.get_fields()
-        if f.concrete and not f.auto_created
-    ]
-    data = {}
+                accepted.append(row)
+                accepted_numbers.append(number)
 
-    for field in model_fields:
-        val = raw_data.get(field, None)
+        if accepted:
+            columns, issues = plan.build_block(accepted)
+            for offset in sorted(issues):
+                progress.warn(accepted_numbers[offset], issues[offset])
+            writer.write_block(columns)
+        progress.block_read(len(block))
+        row_number += len(block)
+
+
+def process_csv(file_path, writer, progress, start, end):
+    plan = IngestPlan(read_csv_header(file_path))
+    rows = read_csv_rows(file_path, start, end)
+    ingest_rows(plan, rows, progress.first_row, writer, progress)
+
+
+def process_excel(file_path, writer, progress, min_row=2, max_row=None):
+    # Cells come back typed (dates as datetimes), with formulas as their
+    # cached values, one row in memory at a time.
+    with XlsxReader(file_path) as reader:
+        plan = IngestPlan(read_excel_header(reader))
+
+        rows = reader.iter_rows(min_row=min_row, max_row=max_row)
+        ingest_rows(plan, rows, min_row, writer, progress)
+
+
+@shared_task
+def export_applicants(job_id):
+    """
+    Writes the applicant list an ``ExportJob`` describes (the requesting
+    user's scope plus the stored filter params) under ``MEDIA_ROOT``.
+    """
+    # apis imports this module for its views, so the import is deferred.
+    from .apis import get_filtered_applicants
 
-        field_obj = Applicant._meta.get_field(field)
-        if isinstance(field_obj, CharField):
-            max_len = field_obj.max_length
-            if isinstance(val, str) and len(val) > max_len:
-                val = val[:max_len]
+    job = ExportJob.objects.select_related("requested_by").get(pk=job_id)
+    ExportJob.objects.filter(pk=job_id).update(status=ExportJob.RUNNING, started_at=timezone.now())
+    name = f"exports/{job_id}/applicants.{job.file_format}"
+    path = default_storage.path(name)
 
-        data[field] = val
+    try:
+        if job.requested_by is None:
+            queryset = Applicant.objects.none()
+        else:
+            queryset = get_filtered_applicants(job.requested_by, job.params)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if job.file_format == ExportJob.XLSX:
+            rows = write_xlsx(queryset, path)
+        else:
+            with open(path, "w", newline="", encoding="utf-8") as f:
+                rows = write_csv(queryset, f)
+    except Exception as exc:
+        ExportJob.objects.filter(pk=job_id).update(
+            status=ExportJob.FAILED, finished_at=timezone.now(), error=str(exc)
+        )
+        logger.exception("Export %s failed", job_id)
+        raise
 
-    return Applicant(**data)
+    ExportJob.objects.filter(pk=job_id).update(
+        status=ExportJob.SUCCEEDED, finished_at=timezone.now(), file=name, rows_written=rows
+    )
+    logger.info("Exported %s applicants to %s", rows, name)
+    return rows
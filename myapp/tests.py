@@ -1,3 +1,332 @@
-from django.test import TestCase
+import csv
+import os
+import random
+import tempfile
+from collections import Counter
+from datetime import datetime, timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.utils import timezone
+from django.test import SimpleTestCase, TestCase, override_settings
+from openpyxl import Workbook
+from rest_framework.test import APIClient
+
+from .apis import (
+    CATEGORY_FILTERS,
+    apply_filters,
+    count_facets,
+    get_scoped_applicants,
+    summarize_applicants,
+    summarize_exact,
+)
+from .ingest import DateTimeColumnParser, coerce_datetime, split_csv
+from .models import Applicant, UploadJob, UserProfile, normalize_category
+from .pagination import ApplicantCursorPagination
+from .rollups import rebuild_rollups, refresh_rollups, rollup_key
+from .sampling import sampled_rows
+from .tasks import process_upload_chunk
+
+
+class ApproxAnalyticsTests(TestCase):
+
+    def setUp(self):
+        user = User.objects.create_user("coordinator", password="x")
+        UserProfile.objects.filter(user=user).delete()
+        self.user = User.objects.get(pk=user.pk)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_sampled_rows_of_an_empty_queryset(self):
+        queryset = Applicant.objects.none().values("clean_status")
+        self.assertEqual(sampled_rows(queryset, 1.0), [])
+
+    @mock.patch("myapp.apis.estimate_table_rows", return_value=10_000_000)
+    @mock.patch("myapp.apis.sampling_supported", return_value=True)
+    def test_approx_kpis_for_a_user_without_profile(self, *mocks):
+        response = self.client.get("/api/analytics/kpis/", {"approx": "true"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["totalStudents"], 0)
+        self.assertEqual(response.data["approximation"]["method"], "exact")
+
+
+@override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}})
+class DummyCacheTests(TestCase):
+
+    def test_analytics_without_a_cache(self):
+        client = APIClient()
+        client.force_authenticate(User.objects.create_user("staff", password="x", is_staff=True))
+
+        response = client.get("/api/analytics/kpis/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("ETag", response)
+
+
+class UploadUpsertTests(TestCase):
+    """
+    The newest version of each applicant survives an upload, however the
+    file is chunked and in whatever order the chunks commit.
+    """
+
+    HEADER = ["application_id", "first_name", "region", "application_submitted_at", "applicant_updated_at"]
+
+    def setUp(self):
+        self.media = tempfile.TemporaryDirectory()
+        self.addCleanup(self.media.cleanup)
+        self.path = os.path.join(self.media.name, "applicants.csv")
+
+        rows = []
+        for number in range(20):
+            for version, updated_at in enumerate(["2024-01-01 10:00:00", "2024-03-01 10:00:00", "2024-02-01 10:00:00"]):
+                rows.append([f"APP-{number}", f"v{version}", "Oromia", "2024-01-01 09:00:00", updated_at])
+        # A version without a timestamp never replaces one that has it.
+        rows.append(["APP-0", "undated", "Oromia", "2024-01-01 09:00:00", ""])
+        random.Random(7).shuffle(rows)
+        with open(self.path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(self.HEADER)
+            writer.writerows(rows)
+
+    def ingest(self, chunk_bytes, reverse=False):
+        Applicant.objects.all().delete()
+        job = UploadJob.objects.create(file_name="applicants.csv", file_path=self.path)
+        chunks, _ = split_csv(self.path, chunk_bytes)
+        with override_settings(MEDIA_ROOT=self.media.name):
+            for chunk in reversed(chunks) if reverse else chunks:
+                process_upload_chunk(job.pk, *chunk)
+        return list(
+            Applicant.objects.order_by("application_id").values_list(
+                "application_id", "first_name", "applicant_updated_at"
+            )
+        )
+
+    def test_same_rows_for_any_chunking(self):
+        whole = self.ingest(chunk_bytes=1 << 20)
+
+        self.assertEqual(len(whole), 20)
+        self.assertEqual({first_name for _, first_name, _ in whole}, {"v1"})
+        for chunk_bytes in (1, 200, 1000):
+            for reverse in (False, True):
+                with self.subTest(chunk_bytes=chunk_bytes, reverse=reverse):
+                    self.assertEqual(self.ingest(chunk_bytes, reverse), whole)
+
+
+class ExcelUploadTests(TestCase):
+
+    def test_values_past_the_header_are_rejected(self):
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        path = os.path.join(media.name, "applicants.xlsx")
+        workbook = Workbook()
+        sheet = workbook.active
+        sheet.append(["application_id", "first_name"])
+        sheet.append(["APP-1", "Abebe"])
+        sheet.append(["APP-2", "Kebede", None, None, "stray"])
+        sheet.append([None, None, None, None, "stray"])
+        workbook.save(path)
+        job = UploadJob.objects.create(file_name="applicants.xlsx", file_path=path)
+
+        with override_settings(MEDIA_ROOT=media.name):
+            process_upload_chunk(job.pk, 2, None, 2)
+
+        self.assertEqual(list(Applicant.objects.values_list("application_id", flat=True)), ["APP-1"])
+        job.refresh_from_db()
+        self.assertEqual(job.rows_rejected, 2)
+
+
+class DateTimeColumnParserTests(SimpleTestCase):
+    """
+    The per-column parser returns what ``coerce_datetime`` (dateutil) did.
+    """
+
+    def assertParity(self, values, parser=None):
+        parser = parser or DateTimeColumnParser()
+        for value in values:
+            with self.subTest(value=value):
+                self.assertEqual(parser(value), coerce_datetime(value))
+
+    def test_iso(self):
+        self.assertParity([
+            "2024-03-01",
+            "2024-03-01T10:20",
+            "2024-03-01 10:20:30",
+            "2024-03-01T10:20:30.123456",
+            "2024-03-01T10:20:30Z",
+            "2024-03-01 10:20:30+03:00",
+        ])
+
+    def test_month_first(self):
+        self.assertParity([
+            "03/01/2024",
+            "3/1/2024 10:20",
+            "03/01/2024 22:20:30",
+            "03/01/2024 10:20 PM",
+            "3/1/2024 10:20:30 AM",
+            "2024/03/01 10:20",
+        ])
+
+    def test_excel_numbers_blanks_and_datetimes(self):
+        self.assertParity([45000, 45000.5, None, "", "   ", datetime(2024, 3, 1, 10, 20)])
+
+    def test_unparseable(self):
+        self.assertParity(["not a date", "31/31/2024", "2024-13-45", "N/A"])
+
+    def test_column_switching_format(self):
+        parser = DateTimeColumnParser()
+        self.assertParity(["2024-03-01 10:20:30"] * 3, parser)
+        self.assertParity(["03/02/2024 10:20:30", "03/03/2024 10:20:30"], parser)
+        self.assertParity(["2024-03-04 10:20:30", "March 5, 2024", "2024-03-06"], parser)
+        self.assertEqual(parser.format, "iso")
+
+
+def create_applicants(count, seed=0):
+    """
+    Creates ``count`` applicants spread over a week of submissions (some
+    late in the evening, some without a date) and a few values of each
+    category, spelled inconsistently as uploads are.
+    """
+    rng = random.Random(seed)
+    start = timezone.make_aware(datetime(2024, 3, 1))
+    applicants = []
+    for number in range(count):
+        submitted_at = None
+        if rng.random() > 0.1:
+            submitted_at = start + timedelta(days=rng.randrange(7), hours=rng.choice([1, 12, 23]), minutes=30)
+        applicants.append(Applicant(
+            application_id=f"APP-{seed}-{number}",
+            first_name=f"Applicant {number}",
+            application_status=rng.choice(["Enrolled", "enrolled ", "Closed", "Submitted", None]),
+            nd_title=rng.choice(["Data Analyst", "Web Dev"]),
+            gender=rng.choice(["Male", "Female", " female", None]),
+            region=rng.choice(["Oromia", "Amhara", "oromia", "Tigray"]),
+            application_submitted_at=submitted_at,
+        ))
+    for applicant in applicants:
+        applicant.fill_normalized_fields()
+    return Applicant.objects.bulk_create(applicants)
+
+
+class RollupSummaryTests(TestCase):
+    """
+    Summaries read from the daily rollups match a count over the raw rows.
+    """
+
+    FILTERS = [
+        {},
+        {"status": "Enrolled"},
+        {"region": "oromia", "gender": "FEMALE"},
+        {"courseName": "data analyst", "status": "closed"},
+        {"date_from": "2024-03-02", "date_to": "2024-03-04"},
+        {"date_to": "2024-03-01", "region": "Amhara"},
+    ]
+
+    def setUp(self):
+        create_applicants(120)
+        rebuild_rollups()
+        self.staff = User.objects.create_user("staff", password="x", is_staff=True)
+        coordinator = User.objects.create_user("coordinator", password="x")
+        UserProfile.objects.filter(user=coordinator).update(region="Oromia")
+        self.coordinator = User.objects.get(pk=coordinator.pk)
+
+    def assertMatchesRawRows(self):
+        for user in (self.staff, self.coordinator):
+            for params in self.FILTERS:
+                with self.subTest(user=user.username, params=params):
+                    raw = summarize_applicants(apply_filters(get_scoped_applicants(user), params))
+                    self.assertEqual(summarize_exact(user, params), raw)
+
+    def test_rebuilt_rollups(self):
+        self.assertGreater(summarize_exact(self.staff, {})["total"], 0)
+        self.assertMatchesRawRows()
+
+    def test_refreshed_rollups(self):
+        added = create_applicants(30, seed=1)
+        Applicant.objects.filter(pk__in=[applicant.pk for applicant in added[:10]]).update(
+            application_submitted_at=timezone.make_aware(datetime(2024, 3, 20))
+        )
+        rows = Applicant.objects.filter(pk__in=[applicant.pk for applicant in added]).values(
+            "application_submitted_at", "clean_region"
+        )
+        refresh_rollups({rollup_key(row) for row in rows})
+        self.assertMatchesRawRows()
+
+
+@mock.patch.object(ApplicantCursorPagination, "page_size", 7)
+class KeysetPaginationTests(TestCase):
+
+    def setUp(self):
+        applicants = create_applicants(45)
+        Applicant.objects.filter(pk__in=[applicant.pk for applicant in applicants[::6]]).update(
+            application_submitted_at=None
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user("staff", password="x", is_staff=True))
+
+    def get_page(self, url):
+        # Passing data would replace the query string, cursor included.
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_pages_forward_and_back_across_null_dates(self):
+        expected = list(
+            Applicant.objects.order_by(*ApplicantCursorPagination.ordering).values_list("application_id", flat=True)
+        )
+        self.assertIn(None, Applicant.objects.values_list("application_submitted_at", flat=True))
+
+        pages = [self.get_page("/api/students/?fields=application_id")]
+        while pages[-1]["next"]:
+            pages.append(self.get_page(pages[-1]["next"]))
+        ids = [row["application_id"] for page in pages for row in page["results"]]
+        self.assertEqual(ids, expected)
+
+        page = pages[-1]
+        for previous in reversed(pages[:-1]):
+            page = self.get_page(page["previous"])
+            self.assertEqual(page["results"], previous["results"])
+        self.assertIsNone(page["previous"])
+
+
+class FacetCountTests(TestCase):
+    """
+    Each facet counts the raw rows matching every filter but its own.
+    """
+
+    FILTERS = RollupSummaryTests.FILTERS + [
+        {"status": "enrolled", "gender": "female", "region": "Oromia", "courseName": "Web Dev"},
+        {"status": "nobody", "date_from": "2024-03-03"},
+    ]
+
+    def setUp(self):
+        create_applicants(150)
+        rebuild_rollups()
+        self.staff = User.objects.create_user("staff", password="x", is_staff=True)
+        coordinator = User.objects.create_user("coordinator", password="x")
+        UserProfile.objects.filter(user=coordinator).update(region="Oromia")
+        self.coordinator = User.objects.get(pk=coordinator.pk)
+
+    def raw_facets(self, user, params):
+        facets = {}
+        for param, field in CATEGORY_FILTERS.items():
+            others = {name: value for name, value in params.items() if name != param}
+            counts = Counter(apply_filters(get_scoped_applicants(user), others).values_list(field, flat=True))
+            counts.pop(None, None)
+            counts.pop("", None)
+            if params.get(param):
+                counts[normalize_category(params[param])] += 0
+            facets[param] = dict(counts)
+        return facets
+
+    def test_each_facet_excludes_its_own_filter(self):
+        for user in (self.staff, self.coordinator):
+            for params in self.FILTERS:
+                with self.subTest(user=user.username, params=params):
+                    result = count_facets(user, params)
+                    facets = {
+                        param: {option["value"]: option["count"] for option in options}
+                        for param, options in result["facets"].items()
+                    }
+                    self.assertEqual(facets, self.raw_facets(user, params))
+                    self.assertEqual(result["total"], apply_filters(get_scoped_applicants(user), params).count())
@@ -0,0 +1,326 @@
+import io
+import re
+import time
+from datetime import datetime
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import Applicant
+from .rollups import rollup_day, rollup_key
+
+COPY_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+COPY_SPECIAL_CHARACTERS = re.compile(r"[\\\t\n\r]")
+
+
+def as_stored_datetime(value):
+    """
+    Returns ``value`` the way it reads back from the database, so an
+    uploaded ``applicant_updated_at`` can be compared with the stored one.
+    """
+    if isinstance(value, datetime) and timezone.is_naive(value):
+        return timezone.make_aware(value)
+    return value
+
+
+def is_newer(incoming, current):
+    """
+    Whether a row with ``applicant_updated_at`` ``incoming`` replaces one
+    with ``current``: it is later, or the first one known. Ties keep the
+    current row, so which version of an applicant survives does not depend
+    on how an upload is split into batches and chunks, or on the order they
+    commit in.
+    """
+    incoming = as_stored_datetime(incoming)
+    if incoming is None:
+        return False
+    current = as_stored_datetime(current)
+    return current is None or incoming > current
+
+
+def split_keyed(rows):
+    """
+    Splits a batch into ``{application_id: row}`` (the newest row wins when
+    an id repeats, see ``is_newer``) and the rows that have no
+    ``application_id`` to upsert on.
+    """
+    keyed = {}
+    unkeyed = []
+    for row in rows:
+        application_id = row["application_id"]
+        if not application_id:
+            unkeyed.append(row)
+            continue
+        kept = keyed.get(application_id)
+        if kept is None or is_newer(row["applicant_updated_at"], kept["applicant_updated_at"]):
+            keyed[application_id] = row
+    return keyed, unkeyed
+
+
+class BulkCreateWriter:
+    """
+    Collects ingested rows (``{field name: value}`` dicts, as built by
+    ``IngestPlan``) and upserts them on ``application_id`` in fixed-size
+    batches, tracking inserted/updated/unchanged counts, throughput and the
+    ``(day, region)`` pairs whose rollups need refreshing.
+
+    A stored row is only replaced by a newer one (``is_newer``); older or
+    equally old rows are skipped. This portable path looks the batch's ids up first, then uses
+    ``bulk_create`` and ``bulk_update``.
+    """
+
+    def __init__(self, batch_size=1000):
+        self.batch_size = batch_size
+        self.batch = []
+        self.touched = set()
+        self.counts = {"inserted": 0, "updated": 0, "unchanged": 0}
+        self.started = time.perf_counter()
+        self.fields = [
+            f
+            for f in Applicant._meta.concrete_fields
+            if not f.primary_key and f.name not in Applicant.TRIGGER_FIELDS
+        ]
+
+    @property
+    def rows(self):
+        return sum(self.counts.values())
+
+    def write(self, row):
+        application_id = row["application_id"]
+        if application_id is not None and not isinstance(application_id, str):
+            row["application_id"] = str(application_id)
+        self.batch.append(row)
+        self.touched.add(rollup_key(row))
+        if len(self.batch) >= self.batch_size:
+            self.flush()
+
+    def write_block(self, columns):
+        """
+        Writes a block of rows given as ``{field name: column values}``, as
+        built by ``IngestPlan.build_block``.
+        """
+        names = list(columns)
+        for values in zip(*columns.values()):
+            self.write(dict(zip(names, values)))
+
+    def flush(self):
+        if self.batch:
+            self.record(len(self.batch), *self.upsert(self.batch))
+            self.batch = []
+
+    def record(self, rows, inserted, updated):
+
+        self.counts["inserted"] += inserted
+        self.counts["updated"] += updated
+        self.counts["unchanged"] += rows - inserted - updated
+
+    def upsert(self, rows):
+        keyed, unkeyed = split_keyed(rows)
+        existing = {
+            application_id: rest
+            for application_id, *rest in Applicant.objects.filter(
+                application_id__in=list(keyed)
+            ).values_list(
+                "application_id",
+                "id",
+                "applicant_updated_at",
+                "application_submitted_at",
+                "clean_region",
+            )
+        }
+
+        inserts = [Applicant(**row) for row in unkeyed]
+        updates = []
+        for application_id, row in keyed.items():
+            current = existing.get(application_id)
+            if current is None:
+                inserts.append(Applicant(**row))
+                continue
+            pk, updated_at, submitted_at, region = current
+            if not is_newer(row["applicant_updated_at"], updated_at):
+                continue
+            self.touched.add((rollup_day(submitted_at), region))
+            updates.append(Applicant(pk=pk, **row))
+
+        Applicant.objects.bulk_create(inserts)
+        if updates:
+            Applicant.objects.bulk_update(updates, [f.name for f in self.fields])
+        return len(inserts), len(updates)
+
+    def close(self):
+        self.flush()
+        seconds = time.perf_counter() - self.started
+        return {
+            "rows": self.rows,
+            **self.counts,
+            "seconds": round(seconds, 3),
+            "rows_per_second": round(self.rows / seconds) if seconds else None,
+        }
+
+
+class CopyWriter(BulkCreateWriter):
+    """
+    PostgreSQL fast path: each batch is streamed with ``COPY ... FROM STDIN``
+    into a transaction-scoped staging table and merged into the applicant
+    table with ``INSERT ... ON CONFLICT (application_id) DO UPDATE``, which
+    only replaces rows with newer ones, as ``is_newer`` decides.
+
+    ``write_block`` formats whole columns straight into COPY lines, without
+    building a dict per row.
+    """
+
+    staging_table = "applicant_staging"
+
+    def __init__(self, batch_size=20000):
+        super().__init__(batch_size=batch_size)
+        quote = connection.ops.quote_name
+        self.table = quote(Applicant._meta.db_table)
+        self.columns = ", ".join(quote(f.column) for f in self.fields)
+        self.assignments = ", ".join(
+            f"{quote(f.column)} = EXCLUDED.{quote(f.column)}" for f in self.fields
+        )
+        self.default_timezone = timezone.get_default_timezone()
+        # COPY lines from write_block(), their application ids and
+        # applicant_updated_at values.
+        self.lines = []
+        self.line_ids = []
+        self.line_updated_at = []
+
+    def format_value(self, field, value):
+        if value is None:
+            return "\\N"
+        if type(value) is datetime:
+            # What get_db_prep_save() returns, without its warning on every
+            # naive value, which made it the slowest step of an upload.
+            if value.tzinfo is None:
+                value = value.replace(tzinfo=self.default_timezone)
+            return str(value)
+        if type(value) is not str:
+            value = str(field.get_db_prep_save(value, connection))
+        return value.translate(COPY_ESCAPES)
+
+    def format_column(self, field, values):
+        """
+        Formats one column of a block as COPY values. Text is only escaped
+        when something in the column needs it, which is rare.
+        """
+        if values.count(None) == len(values):
+            return ["\\N"] * len(values)
+        format_value = self.format_value
+        text = "".join([value for value in values if type(value) is str])
+        if COPY_SPECIAL_CHARACTERS.search(text):
+            return [
+                value.translate(COPY_ESCAPES) if type(value) is str else format_value(field, value)
+                for value in values
+            ]
+        return [value if type(value) is str else format_value(field, value) for value in values]
+
+    def write_block(self, columns):
+        ids = columns["application_id"]
+        if any(value is not None and type(value) is not str for value in ids):
+            ids = [value if value is None or type(value) is str else str(value) for value in ids]
+        columns["application_id"] = ids
+        self.touched.update(
+            zip(map(rollup_day, columns["application_submitted_at"]), columns["clean_region"])
+        )
+
+        formatted = [self.format_column(f, columns[f.name]) for f in self.fields]
+        self.lines.extend(map("\t".join, zip(*formatted)))
+        self.line_ids.extend(ids)
+        self.line_updated_at.extend(columns["applicant_updated_at"])
+        if len(self.lines) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        super().flush()
+        if self.lines:
+            # As split_keyed(): the newest line wins when an id repeats.
+            newest = {}
+            for i, (application_id, updated_at) in enumerate(zip(self.line_ids, self.line_updated_at)):
+                if application_id and (
+                    application_id not in newest
+                    or is_newer(updated_at, self.line_updated_at[newest[application_id]])
+                ):
+                    newest[application_id] = i
+            keyed = [self.lines[i] for i in sorted(newest.values())]
+            unkeyed = [line for application_id, line in zip(self.line_ids, self.lines) if not application_id]
+            self.record(len(self.lines), *self.merge(keyed + unkeyed))
+            self.lines = []
+            self.line_ids = []
+            self.line_updated_at = []
+
+    def upsert(self, rows):
+        keyed, unkeyed = split_keyed(rows)
+        return self.merge([
+            "\t".join(self.format_value(f, row[f.name]) for f in self.fields)
+            for row in [*keyed.values(), *unkeyed]
+        ])
+
+    @staticmethod
+    def newer(incoming, current):
+        """
+        ``is_newer`` in SQL, for the ``applicant_updated_at`` of the tables
+        (or aliases) ``incoming`` and ``current``.
+        """
+        return (
+            f"{incoming}.applicant_updated_at IS NOT NULL "
+            f"AND ({current}.applicant_updated_at IS NULL "
+            f"OR {incoming}.applicant_updated_at > {current}.applicant_updated_at)"
+        )
+
+    def merge(self, lines):
+        """
+        Copies ``lines`` into the staging table and merges them into the
+        applicant table; returns ``(inserted, updated)``.
+        """
+        buffer = io.StringIO("\n".join(lines) + "\n")
+
+        table, staging, columns = self.table, self.staging_table, self.columns
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(
+                f"CREATE TEMP TABLE {staging} ON COMMIT DROP AS "
+                f"SELECT {columns} FROM {table} WITH NO DATA"
+            )
+            cursor.copy_expert(f"COPY {staging} ({columns}) FROM STDIN", buffer)
+
+            # Rows about to be updated may move to another day or region.
+            cursor.execute(
+                f"SELECT a.application_submitted_at, a.clean_region "
+                f"FROM {table} a JOIN {staging} s ON a.application_id = s.application_id "
+                f"WHERE s.application_id > '' AND {self.newer('s', 'a')}"
+            )
+            for submitted_at, region in cursor.fetchall():
+                self.touched.add((rollup_day(submitted_at), region))
+
+            cursor.execute(
+                f"INSERT INTO {table} ({columns}) "
+                f"SELECT {columns} FROM {staging} WHERE application_id > '' "
+                f"ON CONFLICT (application_id) WHERE application_id > '' "
+                f"DO UPDATE SET {self.assignments} "
+                f"WHERE {self.newer('EXCLUDED', table)} "
+                f"RETURNING (xmax = 0)"
+            )
+            results = cursor.fetchall()
+            inserted = sum(1 for (is_insert,) in results if is_insert)
+            updated = len(results) - inserted
+
+            cursor.execute(
+                f"INSERT INTO {table} ({columns}) SELECT {columns} FROM {staging} "
+                f"WHERE application_id IS NULL OR application_id = ''"
+            )
+            inserted += cursor.rowcount
+            # ON COMMIT DROP only fires at the outermost commit; inside an
+            # enclosing transaction the next batch would find it still there.
+            cursor.execute(f"DROP TABLE {staging}")
+        return inserted, updated
+
+
+def get_applicant_writer():
+    """
+    Returns the COPY writer on PostgreSQL (unless ``INGEST_USE_COPY`` is off)
+    and the portable ``bulk_create`` writer everywhere else.
+    """
+    if connection.vendor == "postgresql" and settings.INGEST_USE_COPY:
+        return CopyWriter()
+    return BulkCreateWriter()
@@ -0,0 +1,220 @@
+from xml.etree.ElementTree import iterparse
+
+from openpyxl.reader.excel import ExcelReader
+from openpyxl.styles.stylesheet import apply_stylesheet
+from openpyxl.utils.cell import column_index_from_string, range_boundaries
+from openpyxl.utils.datetime import from_excel, from_ISO8601
+from openpyxl.xml.constants import SHARED_STRINGS, SHEET_MAIN_NS
+
+SHARED_ITEM_TAG = f"{{{SHEET_MAIN_NS}}}si"
+TEXT_TAG = f"{{{SHEET_MAIN_NS}}}t"
+RUN_TAG = f"{{{SHEET_MAIN_NS}}}r"
+DIMENSION_TAG = f"{{{SHEET_MAIN_NS}}}dimension"
+SHEET_DATA_TAG = f"{{{SHEET_MAIN_NS}}}sheetData"
+ROW_TAG = f"{{{SHEET_MAIN_NS}}}row"
+CELL_TAG = f"{{{SHEET_MAIN_NS}}}c"
+VALUE_TAG = f"{{{SHEET_MAIN_NS}}}v"
+INLINE_STRING_TAG = f"{{{SHEET_MAIN_NS}}}is"
+DIGITS = "0123456789"
+
+
+def text_content(element):
+    """
+    Returns the plain text of a shared or inline string: its ``<t>`` plus
+    the ``<t>`` of each rich text run.
+    """
+    if len(element) == 1 and element[0].tag == TEXT_TAG:
+        return element[0].text or ""
+    parts = [element.findtext(TEXT_TAG) or ""]
+    parts.extend(run.findtext(TEXT_TAG) or "" for run in element.iterfind(RUN_TAG))
+    return "".join(parts)
+
+
+class SharedStrings:
+    """
+    The workbook's shared strings table, parsed incrementally: only as far
+    as the highest index looked up so far. Exports write strings in order of
+    first use, so the table is read alongside the sheet instead of up front.
+    """
+
+    def __init__(self, source):
+        self.source = source
+        self.events = iterparse(source, events=("start", "end")) if source else iter(())
+        self.root = None
+        self.strings = []
+
+    def __getitem__(self, index):
+        strings = self.strings
+        while index >= len(strings):
+            for event, element in self.events:
+                if event == "start":
+                    if self.root is None:
+                        self.root = element
+                elif element.tag == SHARED_ITEM_TAG:
+                    # Unescaped like openpyxl does for shared (not inline) strings.
+                    strings.append(text_content(element).replace("x005F_", ""))
+                    # Drop the parsed item from the tree.
+                    self.root.clear()
+                    break
+            else:
+                raise IndexError(f"shared string {index} is not in the table")
+        return strings[index]
+
+    def close(self):
+        if self.source:
+            self.source.close()
+
+
+class XlsxReader:
+    """
+    Streams the cell values of a workbook's active sheet, as
+    ``load_workbook(read_only=True, data_only=True)`` and
+    ``iter_rows(values_only=True)`` would return them: rows padded to the
+    sheet's declared width, missing rows as empty rows, numbers in date
+    formats as ``datetime``, formulas as their cached values.
+
+    The sheet XML is parsed with ``iterparse`` and each row is dropped once
+    read, shared strings are resolved lazily (``SharedStrings``) and rows
+    before ``min_row`` are skipped without converting their cells, so memory
+    stays flat however large the sheet is. openpyxl is still used for the
+    small parts: the manifest, workbook and stylesheet. Use it as a context
+    manager, or ``close()`` it, to close the file.
+    """
+
+    def __init__(self, file_path):
+        self.reader = ExcelReader(file_path, read_only=True, data_only=True)
+        try:
+            self.reader.read_manifest()
+            self.reader.read_workbook()
+            workbook = self.reader.wb
+            apply_stylesheet(self.reader.archive, workbook)
+            self.epoch = workbook.epoch
+            self.date_styles = workbook._date_formats
+            self.timedelta_styles = workbook._timedelta_formats
+
+            sheets = [rel.target for _, rel in self.reader.parser.find_sheets()]
+            self.sheet_path = sheets[workbook._active_sheet_index]
+            self.dimensions = self.read_dimensions()
+        except Exception:
+            self.close()
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.reader.archive.close()
+
+    @property
+    def max_row(self):
+        return self.dimensions[3] if self.dimensions else None
+
+    @property
+    def max_column(self):
+        return self.dimensions[2] if self.dimensions else None
+
+    def read_dimensions(self):
+        """
+        Returns ``(min_col, min_row, max_col, max_row)`` from the sheet's
+        ``<dimension>``, or ``None`` if it does not declare one.
+        """
+        with self.reader.archive.open(self.sheet_path) as source:
+            for _, element in iterparse(source, events=("start",)):
+                if element.tag == DIMENSION_TAG:
+                    try:
+                        return range_boundaries(element.get("ref"))
+                    except (TypeError, ValueError):
+                        return None
+                if element.tag == SHEET_DATA_TAG:
+                    return None
+        return None
+
+    def open_shared_strings(self):
+        part = self.reader.package.find(SHARED_STRINGS)
+        return SharedStrings(self.reader.archive.open(part.PartName[1:]) if part else None)
+
+    def cell_value(self, element, shared_strings):
+        data_type = element.get("t", "n")
+        if data_type == "inlineStr":
+            child = element.find(INLINE_STRING_TAG)
+            return None if child is None else text_content(child)
+
+        value = element.findtext(VALUE_TAG) or None
+        if value is None:
+            return None
+        if data_type == "n":
+            value = float(value) if "." in value or "E" in value or "e" in value else int(value)
+            style = int(element.get("s", 0))
+            if style in self.date_styles:
+                try:
+                    return from_excel(value, self.epoch, timedelta=style in self.timedelta_styles)
+                except (OverflowError, ValueError):
+                    return "#VALUE!"
+            return value
+        if data_type == "s":
+            return shared_strings[int(value)]
+        if data_type == "b":
+            return bool(int(value))
+        if data_type == "d":
+            return from_ISO8601(value)
+        return value
+
+    def iter_rows(self, min_row=1, max_row=None):
+        """
+        Yields the value tuples of rows ``min_row`` to ``max_row`` (inclusive,
+        open-ended if ``None``).
+        """
+        width = self.max_column
+        empty_row = (None,) * width if width else ()
+        shared_strings = self.open_shared_strings()
+        expected = min_row
+        try:
+            with self.reader.archive.open(self.sheet_path) as source:
+                sheet_data = None
+                row_number = 0
+                for event, element in iterparse(source, events=("start", "end")):
+                    if event == "start":
+                        if element.tag == SHEET_DATA_TAG:
+                            sheet_data = element
+                        continue
+                    if element.tag != ROW_TAG:
+                        continue
+
+                    number = element.get("r")
+                    row_number = int(float(number)) if number else row_number + 1
+                    if max_row is not None and row_number > max_row:
+                        break
+                    if row_number >= expected:
+                        for _ in range(expected, row_number):
+                            yield empty_row
+                        yield self.read_row(element, width, shared_strings)
+                        expected = row_number + 1
+                    sheet_data.clear()
+                else:
+                    return
+            # Missing rows up to max_row, when the sheet has rows past it.
+            for _ in range(expected, max_row + 1):
+                yield empty_row
+        finally:
+            shared_strings.close()
+
+    def read_row(self, element, width, shared_strings):
+        cells = []
+        column = 0
+        for cell in element:
+            if cell.tag != CELL_TAG:
+                continue
+            reference = cell.get("r")
+            column = column_index_from_string(reference.rstrip(DIGITS)) if reference else column + 1
+            cells.append((column, self.cell_value(cell, shared_strings)))
+        if not cells and not width:
+            return ()
+
+        values = [None] * (width or cells[-1][0])
+        for column, value in cells:
+            if column <= len(values):
+                values[column - 1] = value
+        return tuple(values)